@@ -5,13 +5,27 @@ Provides common utilities used by both diskmind_fetch and diskmind_web:
 - Config parsing
 - SMART attribute classification (thresholds, delta logic)
 - Seagate composite value decoding
+- Webhook notification queue and delivery
 """
 
+import hashlib
 import json
+import operator
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as _dt, timedelta as _td
+from types import MappingProxyType
 
 VERSION = '1.7'
 
+# Max bound parameters per IN (...) list (SQLite's historical limit is 999)
+SQL_IN_CHUNK = 500
+
 
 # ---------------------------------------------------------------------------
 # SMART Attribute Constants
@@ -107,6 +121,213 @@ def check_threshold(attr_value, rule: dict) -> bool:
     return False
 
 
+# Operators allowed in threshold rules; rules with any other op never match
+THRESHOLD_OPS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+}
+
+# Compiled plans kept per threshold version (see get_threshold_plan)
+THRESHOLD_PLAN_CACHE_SIZE = 8
+
+
+def threshold_version(thresholds: dict) -> str:
+    """Short content hash of a thresholds dict, stable across reloads."""
+    canonical = json.dumps(thresholds, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()[:12]
+
+
+class ThresholdPlan:
+    """Threshold rules compiled for repeated evaluation.
+
+    Each disk type gets one rule table with an entry per attribute:
+    the critical and warning rules with their operator resolved, the
+    display text, and whether the raw value is a Seagate composite that
+    needs decoding. Underscore-prefixed keys and temperature attributes
+    (handled by Type E alerts) are dropped at compile time. Evaluating a
+    disk decodes each attribute once and yields status and issues in a
+    single pass, with the same results as the rule dicts themselves.
+    """
+
+    def __init__(self, thresholds: dict):
+        self.version = threshold_version(thresholds)
+        self.ata = self._compile(thresholds.get('ata') or {}, nvme=False)
+        self.nvme = self._compile(thresholds.get('nvme') or {}, nvme=True)
+
+    @staticmethod
+    def _compile(rules: dict, nvme: bool) -> tuple:
+        """Build the rule table for one disk type.
+
+        Entries with a critical rule come first, in critical rule order, then
+        warning-only attributes. Warnings carry their position in the warning
+        rules, so issues are reported in the same order as the rule dicts.
+        """
+        skip = set(TEMPERATURE_ATTRS_ATA + TEMPERATURE_ATTRS_NVME)
+        
+        def compile_rule(attr_name, rule, order):
+            op = THRESHOLD_OPS.get(rule.get('op', '>'))
+            if op is None:
+                return None
+            return (op, rule.get('value', 0), rule.get('display', attr_name), order)
+        
+        critical = rules.get('critical') or {}
+        warning = rules.get('warning') or {}
+        names = [a for a in critical if not a.startswith('_') and a not in skip]
+        names += [a for a in warning
+                  if a not in critical and not a.startswith('_') and a not in skip]
+        warning_order = {a: i for i, a in enumerate(warning)}
+        
+        table = []
+        for attr_name in names:
+            crit = compile_rule(attr_name, critical[attr_name], 0) if attr_name in critical else None
+            warn = (compile_rule(attr_name, warning[attr_name], warning_order[attr_name])
+                    if attr_name in warning else None)
+            if crit is None and warn is None:
+                continue
+            composite = not nvme and attr_name in SEAGATE_COMPOSITE_ATTRS
+            # Cumulative counters are hidden unless they moved in the time range
+            cumulative = attr_name in CUMULATIVE_EVENT_ATTRS and attr_name not in CRITICAL_STATE_ATTRS
+            table.append((attr_name, composite, cumulative, crit, warn))
+        return tuple(table)
+
+    def evaluate(self, r: dict, history: dict = None,
+                 delta_days: float = None) -> tuple[str, list[dict]]:
+        """Evaluate one disk reading.
+
+        Args:
+            r: Disk reading dict (smart_attributes as dict or JSON string)
+            history: History data for this disk (with deltas)
+            delta_days: Time range in days (None or >= 36500 means all time)
+
+        Returns:
+            (status, issues) where status is 'critical', 'warning' or 'ok'
+            and issues is the list get_disk_issues() describes.
+        """
+        all_time = delta_days is None or delta_days >= 36500
+        return self._evaluate(r, history, all_time)
+
+    def evaluate_many(self, readings: list[dict], histories: dict = None,
+                      delta_days: float = None) -> list[tuple[str, list[dict]]]:
+        """Evaluate a batch of readings, e.g. a whole fleet or scan.
+
+        Args:
+            readings: Disk reading dicts
+            histories: History data keyed by disk_id (falling back to serial)
+            delta_days: Time range in days (None or >= 36500 means all time)
+
+        Returns:
+            List of (status, issues), one per reading, in reading order.
+        """
+        all_time = delta_days is None or delta_days >= 36500
+        evaluate = self._evaluate
+        if not histories:
+            return [evaluate(r, None, all_time) for r in readings]
+        return [evaluate(r, histories.get(r.get('disk_id') or r.get('serial')), all_time)
+                for r in readings]
+
+    def _evaluate(self, r: dict, history, all_time: bool) -> tuple[str, list[dict]]:
+        attrs = r.get('smart_attributes') or {}
+        if isinstance(attrs, str):
+            try:
+                attrs = json.loads(attrs)
+            except Exception:
+                attrs = {}
+        
+        is_nvme = (r.get('type') or '').strip() == 'NVMe'
+        issues = []
+        warnings = []
+        
+        # SMART self-test failure is always critical
+        if r.get('smart_status') not in ('PASSED', 'N/A', None):
+            issues.append({'level': 'critical', 'text': 'SMART Failed'})
+        
+        for attr_name, composite, cumulative, crit, warn in (self.nvme if is_nvme else self.ata):
+            val = attrs.get(attr_name)
+            if val is None:
+                continue
+            
+            # Same coercion as decode_seagate_value() + check_threshold()
+            if is_nvme:
+                check_val = val
+                try:
+                    num = float(val)
+                except (ValueError, TypeError):
+                    continue
+            else:
+                if composite:
+                    check_val = decode_seagate_value(attr_name, val)
+                else:
+                    try:
+                        check_val = int(val)
+                    except (ValueError, TypeError):
+                        check_val = 0
+                num = float(check_val)
+            
+            # A critical hit suppresses the warning, even when filtered out below
+            is_critical = crit is not None and crit[0](num, crit[1])
+            if not is_critical and (warn is None or not warn[0](num, warn[1])):
+                continue
+            
+            if cumulative and not all_time:
+                attr_hist = history.get(attr_name) if history else None
+                delta = attr_hist.get('delta', 0) if isinstance(attr_hist, dict) else 0
+                if not delta > 0:
+                    continue
+            
+            if is_critical:
+                issues.append({'level': 'critical', 'attr': attr_name, 'text': f'{check_val} {crit[2]}'})
+            else:
+                warnings.append((warn[3], {'level': 'warning', 'attr': attr_name,
+                                           'text': f'{check_val} {warn[2]}'}))
+        
+        if issues:
+            status = 'critical'
+        elif warnings:
+            status = 'warning'
+        else:
+            status = 'ok'
+        if len(warnings) > 1:
+            warnings.sort(key=lambda w: w[0])
+        issues.extend(w for _, w in warnings)
+        return status, issues
+
+
+_threshold_plans = OrderedDict()  # version -> ThresholdPlan
+_threshold_plans_lock = threading.Lock()
+_last_threshold_plan = (None, None)  # (thresholds dict, plan) of the last lookup
+
+
+def get_threshold_plan(thresholds: dict) -> ThresholdPlan:
+    """Return the compiled plan for a thresholds dict.
+
+    Plans are cached by threshold_version(), so reloading unchanged
+    thresholds reuses the existing plan. Asking again with the same dict
+    object skips hashing, so a thresholds dict must not be modified in
+    place once evaluated (the loaders always return a new dict).
+    """
+    global _last_threshold_plan
+    last_dict, last_plan = _last_threshold_plan
+    if last_dict is thresholds:
+        return last_plan
+    
+    version = threshold_version(thresholds)
+    with _threshold_plans_lock:
+        plan = _threshold_plans.get(version)
+        if plan is not None:
+            _threshold_plans.move_to_end(version)
+    if plan is None:
+        plan = ThresholdPlan(thresholds)
+        with _threshold_plans_lock:
+            _threshold_plans[version] = plan
+            while len(_threshold_plans) > THRESHOLD_PLAN_CACHE_SIZE:
+                _threshold_plans.popitem(last=False)
+    _last_threshold_plan = (thresholds, plan)
+    return plan
+
+
 def get_disk_issues(r: dict, thresholds: dict, history: dict = None,
                     delta_days: float = None) -> list[dict]:
     """Get list of threshold violations for a disk, filtered by delta time range.
@@ -122,95 +343,17 @@ def get_disk_issues(r: dict, thresholds: dict, history: dict = None,
         - Critical state attrs: always shown if threshold exceeded
         - Cumulative counters: only shown if delta > 0 in time range
     """
-    attrs = r.get('smart_attributes', {})
-    if isinstance(attrs, str):
-        try:
-            attrs = json.loads(attrs)
-        except Exception:
-            attrs = {}
-
-    disk_type = (r.get('type') or '').strip()
-    is_nvme = disk_type == 'NVMe'
-
-    if is_nvme:
-        rules = thresholds.get('nvme', {})
-    else:
-        rules = thresholds.get('ata', {})
-
-    issues = []
-    all_time = delta_days is None or delta_days >= 36500
-
-    # SMART self-test failure is always critical
-    if r.get('smart_status') not in ('PASSED', 'N/A', None):
-        issues.append({'level': 'critical', 'text': 'SMART Failed'})
-
-    def should_show_attr(attr_name: str) -> bool:
-        """Determine if an attribute's issue should be shown based on delta filter."""
-        if all_time:
-            return True
-        if attr_name in CRITICAL_STATE_ATTRS:
-            return True
-        if attr_name in CUMULATIVE_EVENT_ATTRS:
-            if history and attr_name in history:
-                attr_hist = history[attr_name]
-                delta = attr_hist.get('delta', 0) if isinstance(attr_hist, dict) else 0
-                return delta > 0
-            return False
-        return True
-
-    # Temperature attributes don't affect disk status — handled by Type E alerts
-    _temp_skip = set(TEMPERATURE_ATTRS_ATA + TEMPERATURE_ATTRS_NVME)
-
-    # Check critical thresholds
-    for attr_name, rule in rules.get('critical', {}).items():
-        if attr_name.startswith('_') or attr_name in _temp_skip:
-            continue
-        val = attrs.get(attr_name)
-        if val is not None:
-            check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
-            if check_threshold(check_val, rule):
-                if should_show_attr(attr_name):
-                    display = rule.get('display', attr_name)
-                    issues.append({'level': 'critical', 'attr': attr_name, 'text': f'{check_val} {display}'})
-
-    # Check warning thresholds (skip if already critical for same attribute)
-    critical_attrs = set(rules.get('critical', {}).keys())
-    for attr_name, rule in rules.get('warning', {}).items():
-        if attr_name.startswith('_') or attr_name in _temp_skip:
-            continue
-        if attr_name in critical_attrs:
-            val = attrs.get(attr_name)
-            if val is not None:
-                check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
-                if check_threshold(check_val, rules['critical'][attr_name]):
-                    continue
-        val = attrs.get(attr_name)
-        if val is not None:
-            check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
-            if check_threshold(check_val, rule):
-                if should_show_attr(attr_name):
-                    display = rule.get('display', attr_name)
-                    issues.append({'level': 'warning', 'attr': attr_name, 'text': f'{check_val} {display}'})
-
-    return issues
+    return get_threshold_plan(thresholds).evaluate(r, history, delta_days)[1]
 
 
 def classify_disk(r: dict, thresholds: dict, history: dict = None,
                   delta_days: float = None) -> str:
     """Classify disk status based on visible issues (respecting delta filter).
 
-    Returns 'critical', 'warning', or 'ok'.
+    Returns 'critical', 'warning', or 'ok'. When both status and issues
+    are needed, use get_threshold_plan(thresholds).evaluate() instead.
     """
-    issues = get_disk_issues(r, thresholds, history, delta_days)
-
-    for issue in issues:
-        if issue['level'] == 'critical':
-            return 'critical'
-    for issue in issues:
-        if issue['level'] == 'warning':
-            return 'warning'
-
-    return 'ok'
+    return get_threshold_plan(thresholds).evaluate(r, history, delta_days)[0]
 
 
 # ---------------------------------------------------------------------------
@@ -263,6 +406,12 @@ def load_preset_thresholds(config_dir, preset_name: str) -> dict:
     Returns:
         Dict with 'ata' and 'nvme' threshold rules.
     """
+    shipped, user_overrides = _read_threshold_files(config_dir)
+    return _resolve_preset(shipped, user_overrides, preset_name)
+
+
+def _read_threshold_files(config_dir) -> tuple[dict, dict]:
+    """Shipped presets (thresholds.json) and user overrides (custom_thresholds.json)."""
     from pathlib import Path
     config_dir = Path(config_dir)
     
@@ -284,7 +433,11 @@ def load_preset_thresholds(config_dir, preset_name: str) -> dict:
             user_overrides = json.loads(custom_path.read_text())
         except (json.JSONDecodeError, IOError):
             pass
-    
+    return shipped, user_overrides
+
+
+def _resolve_preset(shipped: dict, user_overrides: dict, preset_name: str) -> dict:
+    """Thresholds for preset_name: user override, else shipped preset, else the default."""
     # Check if user has override for this preset
     if preset_name in user_overrides and user_overrides[preset_name] is not None:
         override = user_overrides[preset_name]
@@ -303,6 +456,221 @@ def load_preset_thresholds(config_dir, preset_name: str) -> dict:
     return {'ata': {}, 'nvme': {}}
 
 
+# ---------------------------------------------------------------------------
+# Config Snapshots
+# ---------------------------------------------------------------------------
+#
+# Everything derived from the config directory — the parsed config.yaml, the
+# dashboard and notification thresholds with their compiled plans, and the
+# host registry — is held in one ConfigSnapshot. Snapshots are never changed
+# after they are built: ConfigStore builds a new one when any of the files
+# changes and swaps it in with a single assignment, so a request that took a
+# snapshot sees one consistent config throughout. Files are checked at most
+# every CONFIG_CHECK_INTERVAL seconds; writers call invalidate() to apply
+# their own changes at once.
+
+CONFIG_CHECK_INTERVAL = 2         # Seconds between config file checks
+NOTIFY_DEFAULT_PRESET = 'backblaze'
+
+
+def load_config_file(config_path) -> dict:
+    """Parse config.yaml, falling back to config.yaml.example next to it.
+
+    hosts_file, if set, replaces the hosts list with the file's non-comment
+    lines. If it cannot be read, the hosts list from the config is kept.
+
+    Raises:
+        FileNotFoundError: if neither file exists
+    """
+    import sys
+    from pathlib import Path
+    path = Path(config_path)
+    example_path = path.with_suffix('.yaml.example') if path.suffix == '.yaml' else Path(str(path) + '.example')
+    
+    # Try config.yaml first, then .example
+    if path.exists():
+        path_to_use = path
+    elif example_path.exists():
+        path_to_use = example_path
+    else:
+        raise FileNotFoundError(f"Config not found: {config_path} or {example_path}")
+    
+    with open(path_to_use) as f:
+        config = parse_simple_yaml(f.read())
+    
+    # Load hosts from file if specified
+    if 'hosts_file' in config:
+        try:
+            with open(config['hosts_file']) as f:
+                config['hosts'] = [
+                    line.strip() for line in f 
+                    if line.strip() and not line.startswith('#')
+                ]
+        except OSError as e:
+            print(f"[warn] Cannot read hosts_file: {e}", file=sys.stderr)
+    
+    return config
+
+
+def parse_host_entry(entry) -> dict | None:
+    """Split a config host entry into its parts.
+
+    Entries look like "push:host", "ssh:user@host", "user@host" or
+    "user@host:port"; entries without a prefix are SSH hosts. The port is
+    only split off after a user, so bare IPv6 addresses stay intact.
+
+    Returns:
+        {'host', 'method', 'user', 'port', 'entry'} (user and port may be
+        None), or None for an empty entry
+    """
+    entry = str(entry).strip()
+    rest = entry
+    method = 'ssh'
+    if rest.startswith('push:'):
+        method, rest = 'push', rest[5:]
+    elif rest.startswith('ssh:'):
+        rest = rest[4:]
+    
+    user = port = None
+    if '@' in rest:
+        user, rest = rest.split('@', 1)
+        # Check for port (format: host:port)
+        if ':' in rest:
+            host, port_str = rest.rsplit(':', 1)
+            if port_str.isdigit():
+                rest, port = host, int(port_str)
+    if not rest:
+        return None
+    return {'host': rest, 'method': method, 'user': user, 'port': port, 'entry': entry}
+
+
+class ConfigSnapshot:
+    """Immutable, versioned view of the config directory.
+
+    Attributes:
+        version: Increases with every snapshot a ConfigStore builds
+        config: Parsed config.yaml (shared; copy before changing anything)
+        hosts: Host registry, host -> parse_host_entry() dict, in config
+            order (the first entry wins for a host listed twice)
+        thresholds, plan: Dashboard thresholds (threshold_preset) and their
+            compiled ThresholdPlan
+        notification_thresholds, notification_plan: The same for
+            notifications.threshold_preset, used for alerts on ingest
+        files: Paths whose changes make the snapshot stale
+    """
+
+    __slots__ = ('version', 'config', 'hosts', 'thresholds', 'plan',
+                 'notification_thresholds', 'notification_plan', 'files')
+
+    def __init__(self, config: dict, thresholds_dir, version: int = 1, files: tuple = ()):
+        shipped, user_overrides = _read_threshold_files(thresholds_dir)
+        notify_config = config.get('notifications') or {}
+        thresholds = _resolve_preset(shipped, user_overrides,
+                                     config.get('threshold_preset', DEFAULT_PRESET))
+        notification_thresholds = _resolve_preset(
+            shipped, user_overrides, notify_config.get('threshold_preset', NOTIFY_DEFAULT_PRESET))
+        
+        hosts = {}
+        for entry in config.get('hosts') or []:
+            parsed = parse_host_entry(entry)
+            if parsed is not None and parsed['host'] not in hosts:
+                hosts[parsed['host']] = MappingProxyType(parsed)
+        
+        set_attr = super().__setattr__
+        set_attr('version', version)
+        set_attr('config', config)
+        set_attr('hosts', MappingProxyType(hosts))
+        set_attr('thresholds', thresholds)
+        set_attr('plan', get_threshold_plan(thresholds))
+        set_attr('notification_thresholds', notification_thresholds)
+        set_attr('notification_plan', get_threshold_plan(notification_thresholds))
+        set_attr('files', tuple(files))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ConfigSnapshot is immutable')
+
+    def host_method(self, host: str) -> str | None:
+        """'ssh' or 'push' for a configured host, None if it is not configured."""
+        entry = self.hosts.get(host)
+        return entry['method'] if entry is not None else None
+
+
+class ConfigStore:
+    """Current ConfigSnapshot for a config file, rebuilt when the files change.
+
+    Args:
+        config_path: config.yaml (config.yaml.example next to it is the fallback)
+        thresholds_dir: Directory with thresholds.json and custom_thresholds.json
+            (default: the config file's directory)
+    """
+
+    def __init__(self, config_path, thresholds_dir=None,
+                 check_interval: float = CONFIG_CHECK_INTERVAL):
+        from pathlib import Path
+        self.config_path = Path(config_path)
+        self.thresholds_dir = Path(thresholds_dir) if thresholds_dir else self.config_path.parent
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._signature = None
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> ConfigSnapshot:
+        """Return the current snapshot, rebuilding it if a file has changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() < self._next_check:
+                return snapshot
+            # Signature taken before reading, so a write during the build
+            # shows up as a change on the next check
+            files = snapshot.files if snapshot is not None else self._files({})
+            signature = self._file_signature(files)
+            if snapshot is None or signature != self._signature:
+                snapshot = self._build(snapshot.version + 1 if snapshot is not None else 1)
+                if snapshot.files != files:
+                    signature = self._file_signature(snapshot.files)
+                self._signature = signature
+                self._snapshot = snapshot
+            self._next_check = time.monotonic() + self.check_interval
+            return snapshot
+
+    def invalidate(self):
+        """Re-check the files on the next get() (call after writing them)."""
+        with self._lock:
+            self._next_check = 0
+            self._signature = None
+
+    def _files(self, config: dict) -> tuple:
+        """Files a snapshot built from config depends on."""
+        files = (self.config_path, self.config_path.with_suffix('.yaml.example'),
+                 self.thresholds_dir / 'thresholds.json',
+                 self.thresholds_dir / 'custom_thresholds.json')
+        if config.get('hosts_file'):
+            files += (config['hosts_file'],)
+        return files
+
+    def _build(self, version: int) -> ConfigSnapshot:
+        try:
+            config = load_config_file(self.config_path)
+        except OSError:
+            config = {}
+        return ConfigSnapshot(config, self.thresholds_dir, version, self._files(config))
+
+    @staticmethod
+    def _file_signature(paths) -> tuple:
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+
 # ---------------------------------------------------------------------------
 # Alert Generation
 # ---------------------------------------------------------------------------
@@ -324,10 +692,15 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
                     timestamp: str) -> list[dict]:
     """Compare readings against previous state and generate alerts.
 
+    Previous disk_status rows and temperature baselines for the whole scan
+    are loaded up front, all disks are evaluated in memory, and alerts and
+    snapshots are written in a single transaction.
+
     Args:
-        conn: SQLite connection (must have disk_status and alerts tables)
+        conn: SQLite connection (must have disk_status, temperature_daily,
+            temperature_samples and alerts tables)
         readings: List of reading dicts (smart_attributes must be parsed dicts)
-        thresholds: Threshold rules dict with 'ata' and 'nvme' keys
+        thresholds: Threshold rules dict with 'ata' and 'nvme' keys, or its ThresholdPlan
         timestamp: Current scan timestamp string
 
     Returns:
@@ -336,7 +709,62 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
     cursor = conn.cursor()
     new_alerts = []
 
-    for r in readings:
+    # Load previous state for the whole scan in one pass
+    disk_ids = list({r.get('disk_id') or r.get('serial', '').strip() for r in readings} - {''})
+    previous = {}  # disk_id -> (smart_status, smart_attributes dict, status)
+    for i in range(0, len(disk_ids), SQL_IN_CHUNK):
+        chunk = disk_ids[i:i + SQL_IN_CHUNK]
+        cursor.execute(f'''
+            SELECT disk_id, smart_status, smart_attributes, status FROM disk_status
+            WHERE disk_id IN ({','.join('?' * len(chunk))})
+        ''', chunk)
+        for row in cursor.fetchall():
+            try:
+                old_attrs = json.loads(row[2]) if row[2] else {}
+            except (json.JSONDecodeError, TypeError):
+                old_attrs = {}
+            previous[row[0]] = (row[1] or '', old_attrs, row[3] or 'ok')
+
+    # Temperature baselines over readings newer than timestamp - TEMP_BASELINE_DAYS
+    # (both maintained at ingest): whole days from temperature_daily, the
+    # partial oldest day from its individual samples in temperature_samples.
+    # Per disk this reads up to a day of samples (one per scan) plus up to
+    # TEMP_BASELINE_DAYS daily rows, so the cost grows with scan frequency.
+    baselines = {}  # (disk_id, attr) -> [sum, count, first_ts, last_ts]
+    window = (timestamp, f'-{TEMP_BASELINE_DAYS} days')
+    for i in range(0, len(disk_ids), SQL_IN_CHUNK):
+        chunk = disk_ids[i:i + SQL_IN_CHUNK]
+        cursor.execute(f'''
+            SELECT disk_id, attr, SUM(value), COUNT(*), MIN(timestamp), MAX(timestamp)
+            FROM temperature_samples
+            WHERE disk_id IN ({','.join('?' * len(chunk))})
+              AND timestamp > datetime(?, ?) AND timestamp < date(?, ?, '+1 day')
+            GROUP BY disk_id, attr
+        ''', (*chunk, *window, *window))
+        for row in cursor.fetchall():
+            baselines[(row[0], row[1])] = list(row[2:])
+        cursor.execute(f'''
+            SELECT disk_id, attr, SUM(temp_sum), SUM(temp_count), MIN(first_ts), MAX(last_ts)
+            FROM temperature_daily
+            WHERE disk_id IN ({','.join('?' * len(chunk))}) AND day > date(?, ?)
+            GROUP BY disk_id, attr
+        ''', (*chunk, *window))
+        for row in cursor.fetchall():
+            baseline = baselines.get((row[0], row[1]))
+            if baseline is None:
+                baselines[(row[0], row[1])] = list(row[2:])
+            else:
+                baseline[0] += row[2]
+                baseline[1] += row[3]
+                baseline[3] = row[5]
+
+    # Status and issues for the whole scan, from the compiled thresholds
+    plan = thresholds if isinstance(thresholds, ThresholdPlan) else get_threshold_plan(thresholds)
+    evaluated = plan.evaluate_many(readings)
+
+    snapshots = []  # disk_status upserts, written in scan order
+
+    for r, (new_disk_status, issues) in zip(readings, evaluated):
         disk_id = r.get('disk_id') or r.get('serial', '').strip()
         if not disk_id:
             continue
@@ -357,29 +785,17 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
             except Exception:
                 new_attrs = {}
 
-        # Load previous state
-        cursor.execute(
-            'SELECT smart_status, smart_attributes, status FROM disk_status WHERE disk_id = ?',
-            (disk_id,))
-        row = cursor.fetchone()
+        prev = previous.get(disk_id)
+        # Later readings of the same disk in this scan compare against this one
+        previous[disk_id] = (smart_status or '', new_attrs, new_disk_status)
+        snapshots.append((disk_id, smart_status, json.dumps(new_attrs),
+                          new_disk_status, timestamp))
 
-        if row is None:
+        if prev is None:
             # First time — save snapshot, no alerts
-            cursor.execute('''
-                INSERT INTO disk_status (disk_id, smart_status, smart_attributes, status, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (disk_id, smart_status, json.dumps(new_attrs),
-                  classify_disk(r, thresholds), timestamp))
-            conn.commit()
             continue
 
-        old_smart_status = row[0] or ''
-        try:
-            old_attrs = json.loads(row[1]) if row[1] else {}
-        except (json.JSONDecodeError, TypeError):
-            old_attrs = {}
-        old_disk_status = row[2] or 'ok'
-        new_disk_status = classify_disk(r, thresholds)
+        old_smart_status, old_attrs, old_disk_status = prev
 
         disk_alerts = []
 
@@ -389,7 +805,6 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
             degraded = status_rank.get(new_disk_status, 0) > status_rank.get(old_disk_status, 0)
 
             # Build reason from current issues
-            issues = get_disk_issues(r, thresholds)
             reason = ', '.join(i['text'] for i in issues) if issues else ''
 
             if degraded:
@@ -541,55 +956,38 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
                 }
             else:
                 # Baseline comparison — needs sufficient history
-                cursor.execute('''
-                    SELECT smart_attributes, timestamp FROM readings
-                    WHERE disk_id = ? AND timestamp > datetime(?, '-14 days')
-                    ORDER BY timestamp
-                ''', (disk_id, timestamp))
-                hist_rows = cursor.fetchall()
-
-                # Check minimum history span
-                if hist_rows:
+                baseline = baselines.get((disk_id, temp_attr))
+                if baseline:
+                    temp_sum, temp_count, first_ts, last_ts = baseline
                     try:
-                        first_ts = _dt.fromisoformat(hist_rows[0][1].replace('Z', '+00:00'))
-                        last_ts = _dt.fromisoformat(hist_rows[-1][1].replace('Z', '+00:00'))
-                        history_days = (last_ts - first_ts).total_seconds() / 86400
-                    except (ValueError, TypeError):
+                        first = _dt.fromisoformat(first_ts.replace('Z', '+00:00'))
+                        last = _dt.fromisoformat(last_ts.replace('Z', '+00:00'))
+                        history_days = (last - first).total_seconds() / 86400
+                    except (ValueError, TypeError, AttributeError):
                         history_days = 0
 
-                    if history_days >= TEMP_MIN_HISTORY_DAYS:
-                        temps = []
-                        for hrow in hist_rows:
-                            try:
-                                hattrs = json.loads(hrow[0]) if hrow[0] else {}
-                                hv = hattrs.get(temp_attr)
-                                if hv is not None:
-                                    temps.append(float(hv))
-                            except (json.JSONDecodeError, ValueError, TypeError):
-                                continue
-
-                        if temps:
-                            avg_temp = sum(temps) / len(temps)
-                            deviation = temp_now - avg_temp
-
-                            if deviation >= TEMP_DEVIATION_CRITICAL:
-                                sev = 'critical'
-                            elif deviation >= TEMP_DEVIATION_WARNING:
-                                sev = 'warning'
-                            elif deviation >= TEMP_DEVIATION_INFO:
-                                sev = 'info'
-                            else:
-                                sev = None
-
-                            if sev:
-                                temp_alert = {
-                                    'alert_type': 'temperature',
-                                    'severity': sev,
-                                    'attribute': temp_attr,
-                                    'old_value': _fmt_val(avg_temp),
-                                    'new_value': _fmt_val(temp_now),
-                                    'message': f'{temp_attr}: {_fmt_val(temp_now)}°C (avg {_fmt_val(avg_temp)}°C, +{_fmt_val(deviation)}°C) — {model} ({serial}) on {host}',
-                                }
+                    if history_days >= TEMP_MIN_HISTORY_DAYS and temp_count:
+                        avg_temp = temp_sum / temp_count
+                        deviation = temp_now - avg_temp
+
+                        if deviation >= TEMP_DEVIATION_CRITICAL:
+                            sev = 'critical'
+                        elif deviation >= TEMP_DEVIATION_WARNING:
+                            sev = 'warning'
+                        elif deviation >= TEMP_DEVIATION_INFO:
+                            sev = 'info'
+                        else:
+                            sev = None
+
+                        if sev:
+                            temp_alert = {
+                                'alert_type': 'temperature',
+                                'severity': sev,
+                                'attribute': temp_attr,
+                                'old_value': _fmt_val(avg_temp),
+                                'new_value': _fmt_val(temp_now),
+                                'message': f'{temp_attr}: {_fmt_val(temp_now)}°C (avg {_fmt_val(avg_temp)}°C, +{_fmt_val(deviation)}°C) — {model} ({serial}) on {host}',
+                            }
 
             if temp_alert:
                 disk_alerts.append(temp_alert)
@@ -610,17 +1008,20 @@ def generate_alerts(conn, readings: list[dict], thresholds: dict,
             alert['host'] = host
             alert['timestamp'] = timestamp
 
-        # Update disk_status snapshot
-        cursor.execute('''
-            UPDATE disk_status
-            SET smart_status = ?, smart_attributes = ?, status = ?, updated_at = ?
-            WHERE disk_id = ?
-        ''', (smart_status, json.dumps(new_attrs),
-              new_disk_status, timestamp, disk_id))
-
-        conn.commit()
         new_alerts.extend(disk_alerts)
 
+    # Update disk_status snapshots, one commit for the whole scan
+    cursor.executemany('''
+        INSERT INTO disk_status (disk_id, smart_status, smart_attributes, status, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(disk_id) DO UPDATE SET
+            smart_status = excluded.smart_status,
+            smart_attributes = excluded.smart_attributes,
+            status = excluded.status,
+            updated_at = excluded.updated_at
+    ''', snapshots)
+    conn.commit()
+
     return new_alerts
 
 
@@ -647,15 +1048,16 @@ def check_missing_disks(conn, host: str, scanned_disk_ids: set, timestamp: str)
 
     # Get disks that were on this host in the PREVIOUS scan (not current)
     # We look for the most recent reading per disk BEFORE the current timestamp
+    # (a change-point row counts as seen until its last_confirmed)
     cursor.execute('''
         SELECT r.disk_id, r.device, r.model, r.serial
         FROM readings r
         WHERE r.host = ?
           AND r.timestamp < ?
-          AND r.timestamp > datetime(?, '-7 days')
+          AND (r.timestamp > datetime(?, '-7 days') OR r.last_confirmed > datetime(?, '-7 days'))
         GROUP BY r.disk_id
         HAVING r.timestamp = MAX(r.timestamp)
-    ''', (host, timestamp, timestamp))
+    ''', (host, timestamp, timestamp, timestamp))
     
     previous_disks = cursor.fetchall()
     
@@ -802,9 +1204,30 @@ def check_disk_reappeared(conn, host: str, disk_id: str, timestamp: str) -> list
 # Webhook Notifications
 # ---------------------------------------------------------------------------
 
+# send_notifications() queues messages in notification_log (state 'pending');
+# a NotificationDispatcher delivers them in the background. Both diskmind_web
+# and diskmind_fetch drain the same queue: rows are claimed with a lease.
+NOTIFY_WORKERS = 4                # Deliveries in flight overall
+NOTIFY_ENDPOINT_CONCURRENCY = 2   # Deliveries in flight per endpoint
+NOTIFY_MAX_ATTEMPTS = 6           # Then the message is marked 'failed'
+NOTIFY_RETRY_BASE = 30            # Seconds before the first retry, doubling after each failure
+NOTIFY_RETRY_MAX = 3600
+NOTIFY_BREAKER_FAILURES = 3       # Consecutive failures that open an endpoint's circuit
+NOTIFY_BREAKER_OPEN = 300         # Seconds an open circuit defers that endpoint's messages
+NOTIFY_LEASE = 120                # Seconds a claimed message belongs to one dispatcher
+NOTIFY_POLL_INTERVAL = 5          # Seconds between queue checks when not woken
+
+SEVERITY_ICONS = {'critical': '🔴', 'warning': '🟡', 'info': 'ℹ️', 'recovery': '✅'}
+
+
 def send_notifications(conn, alerts: list[dict], notify_config: dict,
-                       webhook_urls: list = None):
-    """Send webhook notifications for alerts that meet the configured severity.
+                       webhook_urls: list = None) -> int:
+    """Queue webhook notifications for alerts that meet the configured severity.
+
+    Messages are written to notification_log as 'pending' (one commit) and
+    sent by a NotificationDispatcher, so a slow endpoint never holds up the
+    caller. With notifications.digest enabled, each host's alerts from
+    one call go out as a single message per endpoint.
 
     Args:
         conn: SQLite connection
@@ -813,9 +1236,12 @@ def send_notifications(conn, alerts: list[dict], notify_config: dict,
         webhook_urls: List of webhook URL strings. Format: [!]service:url
             service: ntfy, gotify, generic (default)
             ! prefix = disabled
+
+    Returns:
+        Number of messages queued.
     """
     if not alerts:
-        return
+        return 0
 
     import sys
 
@@ -823,10 +1249,11 @@ def send_notifications(conn, alerts: list[dict], notify_config: dict,
     
     # 'off' disables all push notifications
     if min_severity == 'off':
-        return
+        return 0
 
     include_recovery = str(notify_config.get('include_recovery', 'false')).lower() == 'true'
     cooldown_minutes = int(notify_config.get('cooldown_minutes', 60))
+    digest = str(notify_config.get('digest', 'false')).lower() == 'true'
 
     # Parse enabled endpoints: [{service, url, raw}, ...]
     endpoints = []
@@ -837,13 +1264,12 @@ def send_notifications(conn, alerts: list[dict], notify_config: dict,
         endpoints.append({'service': service, 'url': url, 'raw': entry})
 
     if not endpoints:
-        return
+        return 0
 
     severity_rank = {'info': 0, 'warning': 1, 'critical': 2}
     min_rank = severity_rank.get(min_severity, 1)
 
-    cursor = conn.cursor()
-
+    selected = []
     for alert in alerts:
         sev = alert.get('severity', '')
         atype = alert.get('alert_type', '')
@@ -859,9 +1285,18 @@ def send_notifications(conn, alerts: list[dict], notify_config: dict,
         else:
             if severity_rank.get(sev, -1) < min_rank:
                 continue
+        selected.append(alert)
 
-        # Cooldown: skip if a webhook was sent for this disk recently
-        if cooldown_minutes > 0:
+    if not selected:
+        return 0
+
+    cursor = conn.cursor()
+
+    # Cooldown: skip if a webhook was sent (or queued) for this disk recently
+    if cooldown_minutes > 0:
+        last_notified = _last_notified(cursor, {a.get('disk_id', '') for a in selected})
+        kept = []
+        for alert in selected:
             disk_id = alert.get('disk_id', '')
             ts = alert.get('timestamp', '')
             try:
@@ -870,45 +1305,253 @@ def send_notifications(conn, alerts: list[dict], notify_config: dict,
                          ).strftime('%Y-%m-%d %H:%M:%S')
             except (ValueError, TypeError):
                 cutoff = ts
-            cursor.execute('''
-                SELECT COUNT(*) FROM notification_log nl
-                JOIN alerts a ON nl.alert_id = a.id
-                WHERE a.disk_id = ? AND nl.success = 1
-                  AND nl.timestamp > ?
-            ''', (disk_id, cutoff))
-            if cursor.fetchone()[0] > 0:
-                print(f"  Notification skipped (cooldown {cooldown_minutes}m): [{sev}] {alert.get('message', '')}",
-                      file=sys.stderr)
+            last = last_notified.get(disk_id)
+            if last is not None and last > cutoff:
+                print(f"  Notification skipped (cooldown {cooldown_minutes}m): "
+                      f"[{alert.get('severity', '')}] {alert.get('message', '')}", file=sys.stderr)
                 continue
+            last_notified[disk_id] = ts
+            kept.append(alert)
+        selected = kept
+
+    # One message per alert, or per host in digest mode
+    if digest:
+        by_host = {}
+        for alert in selected:
+            by_host.setdefault(alert.get('host'), []).append(alert)
+        messages = list(by_host.values())
+    else:
+        messages = [[alert] for alert in selected]
 
-        title = _format_alert_title(alert)
-        message = alert.get('message', '')
-
+    queued = 0
+    for group in messages:
+        title, message, sev = _format_message(group)
+        first = group[0]
         for ep in endpoints:
-            payload = _format_payload(ep['service'], title, message, sev)
-            url = ep['url']
-
-            # ntfy JSON API: POST to base URL with topic in body
-            if ep['service'] == 'ntfy':
-                from urllib.parse import urlparse
-                parsed = urlparse(url)
-                topic = parsed.path.strip('/')
-                if topic:
-                    payload['topic'] = topic
-                    url = f"{parsed.scheme}://{parsed.netloc}/"
+            send_url, payload = _webhook_request(ep['service'], ep['url'],
+                                                 _format_payload(ep['service'], title, message, sev))
+            cursor.execute('''
+                INSERT INTO notification_log
+                (alert_id, timestamp, channel, success, error, state, next_attempt, send_url, payload)
+                VALUES (?, ?, ?, 0, NULL, 'pending', datetime('now'), ?, ?)
+            ''', (first.get('id'), first.get('timestamp', ''), ep['url'], send_url, json.dumps(payload)))
+            # Digest: the other alerts ride along with the first one's row
+            carrier = cursor.lastrowid
+            cursor.executemany('''
+                INSERT INTO notification_log
+                (alert_id, timestamp, channel, success, error, state, digest_of)
+                VALUES (?, ?, ?, 0, NULL, 'pending', ?)
+            ''', [(a.get('id'), a.get('timestamp', ''), ep['url'], carrier) for a in group[1:]])
+            queued += 1
+    conn.commit()
 
-            success, error = _send_webhook(url, payload)
+    if queued:
+        print(f"  Notifications queued: {queued} ({len(selected)} alerts, {len(endpoints)} endpoints)",
+              file=sys.stderr)
+    return queued
+
+
+def _last_notified(cursor, disk_ids: set) -> dict:
+    """Latest notification_log timestamp per disk that was sent or is still queued."""
+    last = {}
+    disk_ids = list(disk_ids)
+    for i in range(0, len(disk_ids), SQL_IN_CHUNK):
+        chunk = disk_ids[i:i + SQL_IN_CHUNK]
+        cursor.execute(f'''
+            SELECT a.disk_id, MAX(nl.timestamp)
+            FROM notification_log nl
+            JOIN alerts a ON nl.alert_id = a.id
+            WHERE a.disk_id IN ({','.join('?' * len(chunk))})
+              AND (nl.success = 1 OR nl.state = 'pending')
+            GROUP BY a.disk_id
+        ''', chunk)
+        last.update(cursor.fetchall())
+    return last
+
+
+def _format_message(alerts: list[dict]) -> tuple:
+    """Title, message and severity for one alert, or a digest of several."""
+    if len(alerts) == 1:
+        alert = alerts[0]
+        return _format_alert_title(alert), alert.get('message', ''), alert.get('severity', '')
+    rank = {'recovery': 0, 'info': 1, 'warning': 2, 'critical': 3}
+    sev = max((a.get('severity', '') for a in alerts), key=lambda s: rank.get(s, -1))
+    title = f"{SEVERITY_ICONS.get(sev, '')} {len(alerts)} alerts on {alerts[0].get('host', '')}"
+    lines = [f"{SEVERITY_ICONS.get(a.get('severity'), '')} {a.get('message', '')}" for a in alerts]
+    return title, '\n'.join(lines), sev
+
+
+def _webhook_request(service: str, url: str, payload: dict) -> tuple:
+    """Adjust URL and payload for the service. Returns (send_url, payload)."""
+    # ntfy JSON API: POST to base URL with topic in body
+    if service == 'ntfy':
+        from urllib.parse import urlparse
+        parsed = urlparse(url)
+        topic = parsed.path.strip('/')
+        if topic:
+            payload['topic'] = topic
+            url = f"{parsed.scheme}://{parsed.netloc}/"
+    return url, payload
+
+
+class NotificationDispatcher:
+    """Deliver queued notification_log messages in the background.
+
+    Due messages are claimed with a lease, sent by a small worker pool
+    (at most NOTIFY_ENDPOINT_CONCURRENCY at a time per endpoint) and retried
+    with exponential backoff. An endpoint failing NOTIFY_BREAKER_FAILURES
+    times in a row is skipped for NOTIFY_BREAKER_OPEN seconds, then tried
+    with one message before its queue is released again.
+    """
 
-            cursor.execute('''
-                INSERT INTO notification_log (alert_id, timestamp, channel, success, error)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (alert.get('id'), alert.get('timestamp', ''), ep['url'],
-                  int(success), error))
+    def __init__(self, db_path: str, max_attempts: int = NOTIFY_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self._workers = ThreadPoolExecutor(NOTIFY_WORKERS, thread_name_prefix='notify')
+        self._lock = threading.Lock()
+        self._in_flight = {}   # channel -> deliveries running
+        self._breakers = {}    # channel -> (consecutive failures, open until [monotonic])
+        self._wake = threading.Event()
+        self._local = threading.local()
+        self._thread = None
+
+    def start(self):
+        """Run dispatch() in a background thread, every NOTIFY_POLL_INTERVAL or when woken."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        """Dispatch now (call after queueing messages)."""
+        self._wake.set()
+
+    def drain(self, timeout: float) -> int:
+        """Deliver due messages for up to timeout seconds, then stop (one-shot use).
+
+        Messages waiting for a retry stay queued for the next run.
+
+        Returns:
+            Number of deliveries attempted.
+        """
+        deadline = time.monotonic() + timeout
+        attempted = 0
+        while True:
+            started = self.dispatch()
+            attempted += started
+            with self._lock:
+                busy = sum(self._in_flight.values())
+            remaining = deadline - time.monotonic()
+            if (not started and not busy) or remaining <= 0:
+                break
+            self._wake.wait(min(remaining, 1))
+            self._wake.clear()
+        self._workers.shutdown(wait=True)
+        return attempted
+
+    def dispatch(self) -> int:
+        """Claim due messages and hand them to the workers. Returns deliveries started."""
+        conn = self._connection()
+        rows = conn.execute('''
+            SELECT id, channel, send_url, payload FROM notification_log
+            WHERE state = 'pending' AND digest_of IS NULL AND next_attempt <= datetime('now')
+            ORDER BY next_attempt, id
+            LIMIT 200
+        ''').fetchall()
+        started = 0
+        for row_id, channel, send_url, payload in rows:
+            with self._lock:
+                failures, open_until = self._breakers.get(channel, (0, 0))
+                # Half-open after a trip: one message at a time until one succeeds
+                limit = 1 if failures >= NOTIFY_BREAKER_FAILURES else NOTIFY_ENDPOINT_CONCURRENCY
+                busy = self._in_flight.get(channel, 0) >= limit
+            wait = open_until - time.monotonic()
+            if wait > 0:
+                # Circuit open: defer without using up an attempt
+                conn.execute('''
+                    UPDATE notification_log SET next_attempt = datetime('now', ?)
+                    WHERE id = ? AND state = 'pending'
+                ''', (f'+{int(wait) + 1} seconds', row_id))
+                conn.commit()
+                continue
+            if busy:
+                continue  # Picked up when a delivery to this endpoint finishes
+            claimed = conn.execute('''
+                UPDATE notification_log
+                SET attempts = attempts + 1, next_attempt = datetime('now', ?)
+                WHERE id = ? AND state = 'pending' AND next_attempt <= datetime('now')
+            ''', (f'+{NOTIFY_LEASE} seconds', row_id)).rowcount
             conn.commit()
-
-            status_str = '✓' if success else '✗'
-            print(f"  Notification {status_str}: [{sev}] {alert.get('message', '')} → {ep['url']}",
-                  file=sys.stderr)
+            if not claimed:
+                continue  # Another process took it
+            with self._lock:
+                self._in_flight[channel] = self._in_flight.get(channel, 0) + 1
+            self._workers.submit(self._deliver, row_id, channel, send_url, payload)
+            started += 1
+        return started
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path, timeout=30)
+        return conn
+
+    def _run(self):
+        import sys
+        while True:
+            self._wake.wait(NOTIFY_POLL_INTERVAL)
+            self._wake.clear()
+            try:
+                self.dispatch()
+            except sqlite3.Error as e:
+                print(f"[warn] Notification dispatch: {e}", file=sys.stderr)
+            except RuntimeError:
+                return  # Worker pool shut down (interpreter exiting)
+
+    def _deliver(self, row_id: int, channel: str, send_url: str, payload: str):
+        import sys
+        try:
+            payload = json.loads(payload)
+            success, error = _send_webhook(send_url, payload)
+        except Exception as e:
+            payload, success, error = {}, False, str(e)
+        with self._lock:
+            self._in_flight[channel] -= 1
+            if success:
+                self._breakers.pop(channel, None)
+            else:
+                failures, open_until = self._breakers.get(channel, (0, 0))
+                failures += 1
+                if failures >= NOTIFY_BREAKER_FAILURES:
+                    open_until = time.monotonic() + NOTIFY_BREAKER_OPEN
+                self._breakers[channel] = (failures, open_until)
+        try:
+            state = self._record(row_id, success, error)
+        except sqlite3.Error as e:
+            # Not recorded: the message is sent again once its lease expires
+            state = f'unrecorded: {e}'
+        status_str = '✓' if success else '✗'
+        print(f"  Notification {status_str} ({state}): {payload.get('title', '')} → {channel}"
+              + (f" [{error}]" if error else ''), file=sys.stderr)
+        self._wake.set()
+
+    def _record(self, row_id: int, success: bool, error: str) -> str:
+        """Store a delivery result on the message (and its digest rows). Returns the new state."""
+        conn = self._connection()
+        if success:
+            state, delay = 'sent', 0
+        else:
+            attempts = conn.execute(
+                'SELECT attempts FROM notification_log WHERE id = ?', (row_id,)).fetchone()[0]
+            state = 'failed' if attempts >= self.max_attempts else 'pending'
+            delay = min(NOTIFY_RETRY_BASE * 2 ** (attempts - 1), NOTIFY_RETRY_MAX)
+        conn.execute('''
+            UPDATE notification_log
+            SET state = ?, success = ?, error = ?, next_attempt = datetime('now', ?)
+            WHERE id = ? OR digest_of = ?
+        ''', (state, int(success), error, f'+{delay} seconds', row_id, row_id))
+        conn.commit()
+        return state
 
 
 def _parse_webhook_entry(entry: str) -> tuple:
@@ -939,8 +1582,7 @@ def _format_payload(service: str, title: str, message: str,
 def _format_alert_title(alert: dict) -> str:
     """Format a short title for webhook payloads."""
     sev = alert.get('severity', 'info')
-    icons = {'critical': '🔴', 'warning': '🟡', 'info': 'ℹ️', 'recovery': '✅'}
-    icon = icons.get(sev, '')
+    icon = SEVERITY_ICONS.get(sev, '')
     attr = alert.get('attribute', '')
 
     if alert.get('alert_type') == 'smart_status':
@@ -977,6 +1619,39 @@ def _send_webhook(url: str, payload: dict) -> tuple:
         return (False, str(e))
 
 
+_YAML_TRAILING_COMMENT = re.compile(r'\s+#.*$')
+
+
+def _yaml_value(text: str) -> tuple:
+    """The value part of a line as (value, quoted).
+
+    A quoted value loses its quotes and keeps any ``#`` inside them; only
+    what follows the closing quote can be a comment. In an unquoted value
+    a ``#`` after whitespace starts a comment.
+    """
+    text = text.strip()
+    if text[:1] in ('"', "'"):
+        end = text.find(text[0], 1)
+        if end > 0:
+            return text[1:end], True
+    if text.startswith('#'):
+        return '', False
+    return _YAML_TRAILING_COMMENT.sub('', text), False
+
+
+def _yaml_scalar(text: str):
+    """A key's value: int if it is an unquoted number, None if empty."""
+    value, quoted = _yaml_value(text)
+    if quoted:
+        return value
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
 def parse_simple_yaml(text: str) -> dict:
     """Parse simple YAML (flat keys, string values, simple lists, one level of nesting).
 
@@ -984,6 +1659,8 @@ def parse_simple_yaml(text: str) -> dict:
       - Top-level scalar keys:  ``key: value``
       - Top-level lists:        indented ``- item`` lines below a key
       - One-level nested maps:  indented ``subkey: value`` lines below a key
+      - Trailing comments:      ``key: value  # note`` (``#`` after whitespace)
+      - Quoted values:          ``key: "Rack #3"`` (quotes removed, ``#`` kept)
 
     No external YAML library required.
     """
@@ -999,7 +1676,7 @@ def parse_simple_yaml(text: str) -> dict:
         indent = len(raw_line) - len(raw_line.lstrip())
 
         if indent > 0 and current_key and stripped.startswith('- '):
-            val = stripped[2:].strip()
+            val = _yaml_value(stripped[2:])[0]
             if current_list is None:
                 current_list = []
                 result[current_key] = current_list
@@ -1007,25 +1684,19 @@ def parse_simple_yaml(text: str) -> dict:
 
         elif indent > 0 and current_key and ':' in stripped:
             k, _, v = stripped.partition(':')
-            v = v.strip()
+            v = _yaml_scalar(v)
             if not isinstance(result.get(current_key), dict):
                 result[current_key] = {}
-            if v:
-                try:
-                    result[current_key][k.strip()] = int(v)
-                except ValueError:
-                    result[current_key][k.strip()] = v
+            if v is not None:
+                result[current_key][k.strip()] = v
 
         elif ':' in stripped and indent == 0:
             k, _, v = stripped.partition(':')
             k = k.strip()
-            v = v.strip()
+            v = _yaml_scalar(v)
             current_key = k
             current_list = None
-            if v:
-                try:
-                    result[k] = int(v)
-                except ValueError:
-                    result[k] = v
+            if v is not None:
+                result[k] = v
 
     return result
@@ -507,13 +507,104 @@ function renderAttrRow(attrDef, attrs, hist, diskType, showId, dataCoversFilter,
     </tr>`;
 }
 
+// Cursor of the loaded history and the window it was loaded for; polls with
+// a cursor only fetch what was stored since and merge it into historyCache
+let historyCursor = null;
+let historyDays = null;
+// Sparkline points per disk for full loads; the server downsamples to this
+const HISTORY_POINTS = 120;
+
 async function loadHistory(force = false) {
     try {
-        const resp = await fetch(`/api/history?days=${deltaRangeDays}`);
-        if (resp.ok) historyCache = await resp.json();
+        const incremental = !force && historyCursor !== null && historyDays === deltaRangeDays;
+        const since = incremental ? historyCursor : 0;
+        const days = deltaRangeDays;
+        const query = incremental ? `since=${since}` : `since=0&format=compact&points=${HISTORY_POINTS}`;
+        const resp = await fetch(`/api/history?days=${days}&${query}`);
+        if (!resp.ok) return;
+        const update = await resp.json();
+        let longest = 0;
+        if (incremental) longest = mergeHistory(update);
+        else historyCache = expandHistory(update);
+        // Appended raw points outgrow the downsampled ones: reload next time
+        historyCursor = longest > HISTORY_POINTS * 1.5 ? null : update._cursor;
+        historyDays = days;
     } catch (e) { console.warn('History load failed:', e); }
 }
 
+// Compact /api/history (one time axis per disk, aligned value arrays)
+// to per-attribute {t, points, current, delta, min, max, first}
+function expandHistory(compact) {
+    const out = {};
+    for (const [key, disk] of Object.entries(compact)) {
+        if (key.startsWith('_')) { out[key] = disk; continue; }
+        const {t, attrs, ...meta} = disk;
+        out[key] = meta;
+        for (const [name, a] of Object.entries(attrs)) {
+            const ts = [], points = [];
+            a.v.forEach((v, i) => {
+                if (v !== null) { ts.push(t[i]); points.push(v); }
+            });
+            out[key][name] = {t: ts, points, current: a.current, delta: a.delta, min: a.min, max: a.max,
+                              first: a.current - a.delta};
+        }
+    }
+    return out;
+}
+
+// Merge an incremental /api/history response: drop points that left the
+// window, replace each updated disk's tail, then recompute the summaries.
+// Returns the length of the longest series.
+function mergeHistory(update) {
+    let longest = 0;
+    const start = update._window_start;
+    for (const [diskId, disk] of Object.entries(historyCache)) {
+        if (diskId.startsWith('_')) continue;
+        if (!update[diskId] && (disk._last || '') <= start) {
+            delete historyCache[diskId];
+            continue;
+        }
+        const tail = update[diskId] ? update[diskId]._tail : null;
+        for (const [key, h] of Object.entries(disk)) {
+            if (key.startsWith('_')) continue;
+            let lo = 0, hi = h.t.length;
+            while (lo < hi && h.t[lo] <= start) lo++;
+            if (tail !== null) while (hi > lo && h.t[hi - 1] >= tail) hi--;
+            h.t = h.t.slice(lo, hi);
+            h.points = h.points.slice(lo, hi);
+            if (lo > 0) delete h.first;  // Baseline bucket left the window
+        }
+    }
+    for (const [diskId, changed] of Object.entries(update)) {
+        if (diskId.startsWith('_')) continue;
+        const disk = historyCache[diskId] || (historyCache[diskId] = {});
+        for (const [key, value] of Object.entries(changed)) {
+            if (key === '_tail') continue;
+            if (key.startsWith('_')) { disk[key] = value; continue; }
+            const h = disk[key] || (disk[key] = {t: [], points: []});
+            h.t.push(...value.t);
+            h.points.push(...value.points);
+        }
+    }
+    for (const [diskId, disk] of Object.entries(historyCache)) {
+        if (diskId.startsWith('_')) continue;
+        for (const [key, h] of Object.entries(disk)) {
+            if (key.startsWith('_')) continue;
+            const pts = h.points;
+            if (!pts.length) { delete disk[key]; continue; }
+            longest = Math.max(longest, pts.length);
+            h.current = pts[pts.length - 1];
+            h.delta = h.current - (h.first !== undefined ? h.first : pts[0]);
+            h.min = Math.min(...pts);
+            h.max = Math.max(...pts);
+        }
+    }
+    historyCache._first_seen = update._first_seen;
+    historyCache._cursor = update._cursor;
+    historyCache._window_start = start;
+    return longest;
+}
+
 let _consecutiveFailures = 0;
 
 function showConnectionBanner(msg, isError) {
@@ -527,14 +618,21 @@ function hideConnectionBanner() {
     document.getElementById('connectionBanner').classList.remove('visible');
 }
 
+// ETag of the last /api/disks response; unchanged polls come back as 304
+let _disksEtag = null;
+
 async function loadData() {
     try {
+        const headers = _disksEtag ? {'If-None-Match': _disksEtag} : {};
         const [diskResp] = await Promise.all([
-            fetch('/api/disks'),
+            fetch('/api/disks', {headers, cache: 'no-store'}),
             loadHistory(),
         ]);
-        if (!diskResp.ok) throw new Error('HTTP ' + diskResp.status);
-        data = await diskResp.json();
+        if (diskResp.status !== 304) {
+            if (!diskResp.ok) throw new Error('HTTP ' + diskResp.status);
+            data = await diskResp.json();
+            _disksEtag = diskResp.headers.get('ETag');
+        }
         renderData();
         document.getElementById('error').style.display = 'none';
         if (_consecutiveFailures > 0) {
@@ -552,8 +650,8 @@ async function loadData() {
     }
 }
 
-// Refresh history periodically
-setInterval(loadHistory, 120000);
+// Refresh history periodically (live events trigger refreshes while connected)
+setInterval(() => { if (!eventsConnected) loadHistory(); }, 120000);
 
 function renderData() {
     // Save expanded detail rows and secondary sections before re-render
@@ -1314,12 +1412,67 @@ let refreshTimer = null;
 
 function startAutoRefresh() {
     if (refreshTimer) clearInterval(refreshTimer);
+    refreshTimer = null;
     const seconds = parseInt(localStorage.getItem('refreshInterval') || '60');
-    if (seconds > 0) {
+    // Polling is only the fallback while the live event stream is down
+    if (seconds > 0 && !eventsConnected) {
         refreshTimer = setInterval(loadData, seconds * 1000);
     }
 }
 
+// --- Live Events ---
+// /api/events pushes ingest, host-status, alert and archive events. While
+// it is open the polling timers stand down; they resume if it drops.
+let eventsConnected = false;
+let _eventRefreshTimer = null;
+let _alertBadgeTimer = null;
+
+function scheduleRefresh() {
+    // Coalesce bursts (a collect run emits several events); loadData is
+    // cheap here: unchanged /api/disks is a 304, history is incremental
+    if (_eventRefreshTimer) return;
+    _eventRefreshTimer = setTimeout(() => {
+        _eventRefreshTimer = null;
+        loadData();
+    }, 1000);
+}
+
+function connectEvents() {
+    if (!window.EventSource) return;
+    const source = new EventSource('/api/events');
+    source.addEventListener('open', () => {
+        eventsConnected = true;
+        startAutoRefresh();
+    });
+    source.addEventListener('error', () => {
+        // EventSource reconnects by itself (and replays missed events);
+        // poll in the meantime, or for good if the server refused the stream
+        if (eventsConnected) {
+            eventsConnected = false;
+            startAutoRefresh();
+        }
+    });
+    source.addEventListener('ingest', scheduleRefresh);
+    source.addEventListener('archive', scheduleRefresh);
+    source.addEventListener('data-changed', scheduleRefresh);
+    source.addEventListener('resync', () => loadData());
+    source.addEventListener('alert', () => {
+        // One badge update per burst (a scan can raise many alerts at once)
+        if (_alertBadgeTimer) return;
+        _alertBadgeTimer = setTimeout(() => {
+            _alertBadgeTimer = null;
+            loadAlertBadge();
+        }, 200);
+    });
+    source.addEventListener('host-status', e => {
+        const {host, ...status} = JSON.parse(e.data);
+        if (data.host_status && host in data.host_status) {
+            data.host_status[host] = status;
+            renderData();
+        }
+    });
+}
+
 function saveRefreshInterval() {
     const val = document.getElementById('refreshIntervalSelect').value;
     localStorage.setItem('refreshInterval', val);
@@ -1995,16 +2148,31 @@ async function saveHostEdit(oldIp) {
     }
 }
 
+// Queue an SSH collection and wait until its job has finished. The server
+// merges overlapping requests, so this may wait on a job someone else started.
+async function runCollect(request) {
+    const res = await fetch('/api/collect', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(request)
+    });
+    let job = await res.json();
+    if (!res.ok) throw new Error(job.error || `Collect failed (${res.status})`);
+    while (job.state === 'queued' || job.state === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const statusRes = await fetch(`/api/collect/status?id=${job.job_id}`);
+        if (!statusRes.ok) break;
+        job = await statusRes.json();
+    }
+    return job;
+}
+
 async function rescanHost(hostname) {
     const btn = event.target;
     btn.classList.add('spinning');
     
     try {
-        await fetch('/api/collect', {
-            method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({host: hostname})
-        });
+        await runCollect({host: hostname});
         await loadData();
     } catch (e) {
         console.error('Failed to rescan host:', e);
@@ -2034,13 +2202,8 @@ async function refreshAllHosts() {
     const sshHosts = allHosts.filter(h => (cfgMap[h]?.method || 'ssh') === 'ssh');
     
     try {
-        for (const host of sshHosts) {
-            const entry = cfgMap[host]?.full || host;
-            await fetch('/api/collect', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({host: entry})
-            });
+        if (sshHosts.length) {
+            await runCollect({hosts: sshHosts.map(host => cfgMap[host]?.full || host)});
         }
         await loadData();
     } catch (e) {
@@ -2167,11 +2330,7 @@ async function addHostFromInput() {
             // Only trigger SSH fetch for SSH hosts
             if (method === 'ssh') {
                 try {
-                    await fetch('/api/collect', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({host: hostEntry})
-                    });
+                    await runCollect({host: hostEntry});
                 } catch (e) {
                     console.warn('Fetch failed:', e);
                 }
@@ -2956,3 +3115,4 @@ fetch('/api/settings').then(r => r.json()).then(s => {
 const savedInterval = localStorage.getItem('refreshInterval') || '60';
 document.getElementById('refreshIntervalSelect').value = savedInterval;
 startAutoRefresh();
+connectEvents();
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark: store_readings, one query and insert per disk vs one batch
+
+Stores N synthetic readings (30 attributes each) into a database that
+already holds N rows, then the same batch again (all duplicates within
+the 2-minute window). Compares:
+
+  per-row   the original store_readings: a dedup SELECT and two INSERTs
+            per disk, then one commit
+  batched   the batched dedup and executemany writes (readings and
+            disk_first_seen only, as introduced)
+  current   bin/diskmind_fetch store_readings, which also maintains the
+            derived tables (current state, attribute series, temperatures)
+
+per-row and batched are checked to leave identical readings and
+disk_first_seen tables before anything is timed.
+
+Usage: python3 tests/bench_store_readings.py [--readings N]
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BIN = Path(__file__).resolve().parent.parent / 'bin'
+
+
+def load_fetch():
+    loader = importlib.machinery.SourceFileLoader('diskmind_fetch', str(BIN / 'diskmind_fetch'))
+    spec = importlib.util.spec_from_loader('diskmind_fetch', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def _row(r: dict, timestamp: str, source: str) -> tuple:
+    wwn = r.get('wwn', '').strip()
+    serial = r.get('serial', '').strip()
+    return (
+        wwn if wwn else serial, wwn or None, serial, timestamp,
+        r.get('host'), r.get('device'), r.get('type'), r.get('model'),
+        int(r.get('capacity_bytes') or 0), r.get('firmware') or None,
+        int(r.get('rpm') or 0) or None, int(r.get('sector_size') or 0) or None,
+        r.get('smart_status'), r.get('smart_attributes', '{}'), source,
+    )
+
+
+_INSERT_READING = '''
+    INSERT OR REPLACE INTO readings
+    (disk_id, wwn, serial, timestamp, host, device, type, model,
+     capacity_bytes, firmware, rpm, sector_size,
+     smart_status, smart_attributes, source)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def store_per_row(conn: sqlite3.Connection, readings: list[dict], timestamp: str, source: str = None):
+    """The original store_readings: dedup query and inserts disk by disk."""
+    cursor = conn.cursor()
+    for r in readings:
+        row = _row(r, timestamp, source)
+        cursor.execute('''
+            SELECT 1 FROM readings
+            WHERE disk_id = ? AND timestamp > datetime(?, '-2 minutes')
+            LIMIT 1
+        ''', (row[0], timestamp))
+        if cursor.fetchone():
+            continue
+        cursor.execute('INSERT OR IGNORE INTO disk_first_seen (disk_id, first_seen) VALUES (?, ?)',
+                       (row[0], timestamp))
+        cursor.execute(_INSERT_READING, row)
+    conn.commit()
+
+
+def store_batched(conn: sqlite3.Connection, readings: list[dict], timestamp: str, source: str = None):
+    """Batched dedup (chunked IN queries) and executemany in one transaction."""
+    rows = [_row(r, timestamp, source) for r in readings]
+    cursor = conn.cursor()
+    disk_ids = list({row[0] for row in rows})
+    recent = set()
+    chunk_size = sys.modules['diskmind_core'].SQL_IN_CHUNK
+    for i in range(0, len(disk_ids), chunk_size):
+        chunk = disk_ids[i:i + chunk_size]
+        cursor.execute(f'''
+            SELECT DISTINCT disk_id FROM readings
+            WHERE disk_id IN ({','.join('?' * len(chunk))})
+              AND timestamp > datetime(?, '-2 minutes')
+        ''', (*chunk, timestamp))
+        recent.update(row[0] for row in cursor.fetchall())
+    to_insert = []
+    for row in rows:
+        if row[0] in recent:
+            continue
+        recent.add(row[0])
+        to_insert.append(row)
+    with conn:
+        cursor.executemany('INSERT OR IGNORE INTO disk_first_seen (disk_id, first_seen) VALUES (?, ?)',
+                           [(row[0], timestamp) for row in to_insert])
+        cursor.executemany(_INSERT_READING, to_insert)
+
+
+def make_readings(n: int, seed: int = 1) -> list[dict]:
+    rnd = random.Random(seed)
+    readings = []
+    for i in range(n):
+        attrs = {f'Attr_{a}': str(rnd.randint(0, 100000)) for a in range(28)}
+        attrs['Temperature_Celsius'] = str(rnd.randint(25, 45))
+        attrs['Power_On_Hours'] = str(rnd.randint(0, 50000))
+        readings.append({
+            'wwn': f'5000c500{i:08x}', 'serial': f'S{i:07d}', 'host': f'h{i % 100}',
+            'device': f'/dev/sd{i % 26}', 'type': 'HDD', 'model': 'ST4000NM0035',
+            'capacity_bytes': '4000787030016', 'firmware': 'TN03', 'rpm': '7200',
+            'sector_size': '512', 'smart_status': 'PASSED',
+            'smart_attributes': json.dumps(attrs),
+        })
+    return readings
+
+
+def main():
+    parser = argparse.ArgumentParser(description='store_readings benchmark')
+    parser.add_argument('--readings', type=int, default=10000, help='Readings per batch (default: 10000)')
+    args = parser.parse_args()
+
+    fetch = load_fetch()
+    readings = make_readings(args.readings)
+    old_ts, ts = '2026-01-01 00:00:00', '2026-01-01 01:00:00'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def fresh(name):
+            conn = fetch.init_database(str(Path(tmp) / f'{name}.db'))
+            store_batched(conn, readings, old_ts)  # Existing history
+            return conn
+
+        # Equivalence of the two implementations
+        tables = {}
+        for name, store in (('per-row', store_per_row), ('batched', store_batched)):
+            conn = fresh(f'check-{name}')
+            store(conn, readings + readings[:10], ts)
+            tables[name] = (conn.execute('SELECT * FROM readings ORDER BY disk_id, timestamp').fetchall(),
+                            conn.execute('SELECT * FROM disk_first_seen ORDER BY disk_id').fetchall())
+            conn.close()
+        same = tables['per-row'] == tables['batched']
+        print(f"Equivalence: readings and disk_first_seen {'identical' if same else 'DIFFER'}")
+
+        n = len(readings)
+        for name, store in (('per-row', store_per_row), ('batched', store_batched),
+                            ('current', fetch.store_readings)):
+            conn = fresh(name)
+            start = time.perf_counter()
+            store(conn, readings, ts)
+            insert_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            store(conn, readings, ts)
+            duplicate_ms = (time.perf_counter() - start) * 1000
+            conn.close()
+            print(f"{name:8} ({n} readings): insert {insert_ms:7.1f} ms   all-duplicate batch {duplicate_ms:7.1f} ms")
+
+    sys.exit(0 if same else 1)
+
+
+if __name__ == '__main__':
+    main()
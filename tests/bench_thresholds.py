@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: threshold evaluation, per-rule functions vs compiled ThresholdPlan
+
+Builds 10k synthetic disks (ATA and NVMe, odd raw values, JSON and dict
+attributes, random history deltas) and times the dashboard and alert
+evaluation with the rule-by-rule classify_disk/get_disk_issues pair kept
+in tests/reference_thresholds.py against ThresholdPlan.evaluate_many of
+the working tree.
+
+Before timing, every disk is checked for identical status and issues under
+every shipped preset plus an extra preset with unusual rules; the script
+exits non-zero on any mismatch (tests/test_threshold_plan.py runs the same
+check on fewer disks).
+
+Usage: python3 tests/bench_thresholds.py [--disks N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import reference_thresholds as old
+from reference_thresholds import load_presets, make_disks
+import diskmind_core as new
+
+
+def best_ms(func, runs: int = 5) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Threshold evaluation benchmark')
+    parser.add_argument('--disks', type=int, default=10000, help='Synthetic disks (default: 10000)')
+    args = parser.parse_args()
+
+    presets = load_presets()
+    readings, histories = make_disks(args.disks)
+
+    # Equivalence: status and issues per disk, with and without history
+    mismatches = 0
+    for thresholds in presets.values():
+        plan = new.get_threshold_plan(thresholds)
+        for delta_days in (None, 7, 36500):
+            results = plan.evaluate_many(readings, histories, delta_days)
+            for r, (status, issues) in zip(readings, results):
+                history = histories[r['disk_id']]
+                if (old.classify_disk(r, thresholds, history, delta_days) != status
+                        or old.get_disk_issues(r, thresholds, history, delta_days) != issues):
+                    mismatches += 1
+    print(f"Equivalence: {len(presets) * 3 * len(readings)} evaluations, "
+          f"{mismatches} mismatches ({', '.join(presets)})")
+
+    thresholds = presets['backblaze']
+
+    def old_dashboard():
+        for r in readings:
+            history = histories[r['disk_id']]
+            old.classify_disk(r, thresholds, history, 7)
+            old.get_disk_issues(r, thresholds, history, 7)
+
+    def new_dashboard():
+        new.get_threshold_plan(thresholds).evaluate_many(readings, histories, 7)
+
+    def old_alerts():
+        for r in readings:
+            old.classify_disk(r, thresholds)
+            old.get_disk_issues(r, thresholds)
+
+    def new_alerts():
+        new.get_threshold_plan(thresholds).evaluate_many(readings)
+
+    n = len(readings)
+    print(f"Dashboard ({n} disks):  baseline {best_ms(old_dashboard):8.1f} ms   plan {best_ms(new_dashboard):8.1f} ms")
+    print(f"Alerts    ({n} disks):  baseline {best_ms(old_alerts):8.1f} ms   plan {best_ms(new_alerts):8.1f} ms")
+    print(f"Plan compile {best_ms(lambda: new.ThresholdPlan(thresholds), 50) * 1000:.0f} us, "
+          f"cached lookup {best_ms(lambda: new.get_threshold_plan(thresholds), 50) * 1000:.1f} us")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+smartctl 7.3 2022-02-28 r5338 [x86_64-linux-6.1.0-18-amd64] (local build)
+Copyright (C) 2002-22, Bruce Allen, Christian Franke, www.smartmontools.org
+
+=== START OF INFORMATION SECTION ===
+Model Family:     Seagate Exos 7E8
+Device Model:     ST4000NM0035-1V4107
+Serial Number:    ZC1A2B3C
+LU WWN Device Id: 5 000c50 0a1b2c3d4
+Firmware Version: TN03
+User Capacity:    4,000,787,030,016 bytes [4.00 TB]
+Sector Sizes:     512 bytes logical, 4096 bytes physical
+Rotation Rate:    7200 rpm
+Form Factor:      3.5 inches
+Device is:        In smartctl database 7.3/5319
+ATA Version is:   ACS-3 T13/2161-D revision 5
+SATA Version is:  SATA 3.1, 6.0 Gb/s (current: 6.0 Gb/s)
+Local Time is:    Fri Oct 16 10:00:00 2026 UTC
+SMART support is: Available - device has SMART capability.
+SMART support is: Enabled
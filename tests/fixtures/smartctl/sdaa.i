@@ -0,0 +1,17 @@
+smartctl 7.3 2022-02-28 r5338 [x86_64-linux-6.1.0-18-amd64] (local build)
+Copyright (C) 2002-22, Bruce Allen, Christian Franke, www.smartmontools.org
+
+=== START OF INFORMATION SECTION ===
+Model Family:     Samsung based SSDs
+Device Model:     Samsung SSD 860 EVO 500GB
+Serial Number:    S3Z1NB0K123456X
+LU WWN Device Id: 5 002538 e40a1b2c3
+Firmware Version: RVT04B6Q
+User Capacity:    500,107,862,016 bytes [500 GB]
+Sector Size:      512 bytes logical/physical
+Rotation Rate:    Solid State Device
+Form Factor:      2.5 inches
+TRIM Command:     Available, deterministic, zeroed
+Device is:        In smartctl database 7.3/5319
+SMART support is: Available - device has SMART capability.
+SMART support is: Enabled
@@ -0,0 +1,5 @@
+smartctl 7.3 2022-02-28 r5338 [x86_64-linux-6.1.0-18-amd64] (local build)
+Copyright (C) 2002-22, Bruce Allen, Christian Franke, www.smartmontools.org
+
+/dev/vda: Unable to detect device type
+Please specify device type with the -d option.
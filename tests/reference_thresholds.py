@@ -0,0 +1,240 @@
+"""
+Reference threshold evaluation for tests/test_threshold_plan.py and
+tests/bench_thresholds.py
+
+classify_disk, get_disk_issues, check_threshold and decode_seagate_value as
+diskmind_core.py evaluated them rule by rule before ThresholdPlan. They are
+kept verbatim, so the compiled plan can be checked against them. The
+synthetic disks and presets both scripts evaluate are defined here too.
+"""
+
+import copy
+import json
+import random
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO / 'bin'))
+from diskmind_core import (CRITICAL_STATE_ATTRS, CUMULATIVE_EVENT_ATTRS,
+                           TEMPERATURE_ATTRS_ATA, TEMPERATURE_ATTRS_NVME)
+
+
+# ---------------------------------------------------------------------------
+# Seagate Decoding
+# ---------------------------------------------------------------------------
+
+def decode_seagate_value(attr_name: str, raw_value) -> int:
+    """Decode Seagate composite 48-bit raw values.
+
+    Seagate packs multiple counters into raw values:
+    - Command_Timeout (#188): low 16 bits = actual timeout count
+    - Raw_Read_Error_Rate (#1): high 16 bits = error count
+    - Seek_Error_Rate (#7): high 16 bits = error count
+    """
+    try:
+        raw = int(raw_value)
+    except (ValueError, TypeError):
+        return 0
+
+    if raw <= 65535:  # Not a composite value
+        return raw
+
+    if attr_name == 'Command_Timeout':
+        return raw & 0xFFFF
+    elif attr_name in ('Raw_Read_Error_Rate', 'Seek_Error_Rate'):
+        return (raw >> 32) & 0xFFFF
+
+    return raw
+
+
+# ---------------------------------------------------------------------------
+# Threshold Checking & Disk Classification
+# ---------------------------------------------------------------------------
+
+def check_threshold(attr_value, rule: dict) -> bool:
+    """Check if an attribute value exceeds a threshold rule."""
+    try:
+        val = float(attr_value)
+    except (ValueError, TypeError):
+        return False
+
+    op = rule.get('op', '>')
+    threshold = rule.get('value', 0)
+
+    if op == '>':
+        return val > threshold
+    elif op == '>=':
+        return val >= threshold
+    elif op == '<':
+        return val < threshold
+    elif op == '<=':
+        return val <= threshold
+    elif op == '==':
+        return val == threshold
+    return False
+
+
+def get_disk_issues(r: dict, thresholds: dict, history: dict = None,
+                    delta_days: float = None) -> list[dict]:
+    """Get list of threshold violations for a disk, filtered by delta time range.
+
+    Args:
+        r: Disk reading dict
+        thresholds: Threshold rules dict with 'ata' and 'nvme' keys
+        history: History data for this disk (with deltas)
+        delta_days: Time range in days (None or >= 36500 means all time)
+
+    Returns:
+        List of issues that should be shown based on:
+        - Critical state attrs: always shown if threshold exceeded
+        - Cumulative counters: only shown if delta > 0 in time range
+    """
+    attrs = r.get('smart_attributes', {})
+    if isinstance(attrs, str):
+        try:
+            attrs = json.loads(attrs)
+        except Exception:
+            attrs = {}
+
+    disk_type = (r.get('type') or '').strip()
+    is_nvme = disk_type == 'NVMe'
+
+    if is_nvme:
+        rules = thresholds.get('nvme', {})
+    else:
+        rules = thresholds.get('ata', {})
+
+    issues = []
+    all_time = delta_days is None or delta_days >= 36500
+
+    # SMART self-test failure is always critical
+    if r.get('smart_status') not in ('PASSED', 'N/A', None):
+        issues.append({'level': 'critical', 'text': 'SMART Failed'})
+
+    def should_show_attr(attr_name: str) -> bool:
+        """Determine if an attribute's issue should be shown based on delta filter."""
+        if all_time:
+            return True
+        if attr_name in CRITICAL_STATE_ATTRS:
+            return True
+        if attr_name in CUMULATIVE_EVENT_ATTRS:
+            if history and attr_name in history:
+                attr_hist = history[attr_name]
+                delta = attr_hist.get('delta', 0) if isinstance(attr_hist, dict) else 0
+                return delta > 0
+            return False
+        return True
+
+    # Temperature attributes don't affect disk status — handled by Type E alerts
+    _temp_skip = set(TEMPERATURE_ATTRS_ATA + TEMPERATURE_ATTRS_NVME)
+
+    # Check critical thresholds
+    for attr_name, rule in rules.get('critical', {}).items():
+        if attr_name.startswith('_') or attr_name in _temp_skip:
+            continue
+        val = attrs.get(attr_name)
+        if val is not None:
+            check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
+            if check_threshold(check_val, rule):
+                if should_show_attr(attr_name):
+                    display = rule.get('display', attr_name)
+                    issues.append({'level': 'critical', 'attr': attr_name, 'text': f'{check_val} {display}'})
+
+    # Check warning thresholds (skip if already critical for same attribute)
+    critical_attrs = set(rules.get('critical', {}).keys())
+    for attr_name, rule in rules.get('warning', {}).items():
+        if attr_name.startswith('_') or attr_name in _temp_skip:
+            continue
+        if attr_name in critical_attrs:
+            val = attrs.get(attr_name)
+            if val is not None:
+                check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
+                if check_threshold(check_val, rules['critical'][attr_name]):
+                    continue
+        val = attrs.get(attr_name)
+        if val is not None:
+            check_val = decode_seagate_value(attr_name, val) if not is_nvme else val
+            if check_threshold(check_val, rule):
+                if should_show_attr(attr_name):
+                    display = rule.get('display', attr_name)
+                    issues.append({'level': 'warning', 'attr': attr_name, 'text': f'{check_val} {display}'})
+
+    return issues
+
+
+def classify_disk(r: dict, thresholds: dict, history: dict = None,
+                  delta_days: float = None) -> str:
+    """Classify disk status based on visible issues (respecting delta filter).
+
+    Returns 'critical', 'warning', or 'ok'.
+    """
+    issues = get_disk_issues(r, thresholds, history, delta_days)
+
+    for issue in issues:
+        if issue['level'] == 'critical':
+            return 'critical'
+    for issue in issues:
+        if issue['level'] == 'warning':
+            return 'warning'
+
+    return 'ok'
+
+
+# ---------------------------------------------------------------------------
+# Synthetic Inputs
+# ---------------------------------------------------------------------------
+
+ATA_ATTRS = ['Reallocated_Sector_Ct', 'Current_Pending_Sector', 'Offline_Uncorrectable',
+             'Reported_Uncorrect', 'Command_Timeout', 'Raw_Read_Error_Rate', 'Seek_Error_Rate',
+             'Temperature_Celsius', 'UDMA_CRC_Error_Count', 'Weird', 'Power_On_Hours']
+NVME_ATTRS = ['Critical_Warning', 'Media_and_Data_Integrity_Errors', 'Available_Spare',
+              'Percentage_Used', 'Temperature', 'Unsafe_Shutdowns']
+
+
+def load_presets() -> dict:
+    """Shipped presets plus one with unknown operators, '_' keys and extra rules."""
+    presets = json.loads((REPO / 'config' / 'thresholds.json').read_text())['presets']
+    odd = copy.deepcopy(presets['conservative'])
+    odd['ata']['critical']['Command_Timeout'] = {'op': '>=', 'value': 5}
+    odd['ata']['critical']['Reported_Uncorrect'] = {'op': '>', 'value': 3, 'display': 'unc'}
+    odd['ata']['warning']['Seek_Error_Rate'] = {'op': '>', 'value': 0}
+    odd['ata']['warning']['Weird'] = {'op': '!=', 'value': 0}
+    odd['ata']['critical']['_note'] = 'x'
+    odd['nvme']['warning']['Unsafe_Shutdowns'] = {'op': '>', 'value': 2}
+    presets['odd'] = odd
+    return {name: {'ata': p['ata'], 'nvme': p['nvme']} for name, p in presets.items()}
+
+
+def make_disks(n: int, seed: int = 1) -> tuple[list[dict], dict]:
+    """n synthetic readings and a history (attr -> {'delta'}) per disk."""
+    rnd = random.Random(seed)
+
+    def value():
+        c = rnd.random()
+        if c < .55:
+            return '0'
+        if c < .75:
+            return str(rnd.randint(1, 200))
+        if c < .85:
+            return str(rnd.randint(1, 1 << 47))  # Packed Seagate counters
+        if c < .9:
+            return rnd.choice(['abc', '1.5', '', '7 (Min/Max 3/9)'])
+        if c < .95:
+            return rnd.randint(0, 20)
+        return str(rnd.randint(0, 100))
+
+    readings = []
+    histories = {}
+    for i in range(n):
+        nvme = rnd.random() < .3
+        attrs = {a: value() for a in (NVME_ATTRS if nvme else ATA_ATTRS) if rnd.random() < .9}
+        readings.append({
+            'disk_id': f'd{i}', 'serial': f'S{i}', 'host': f'h{i % 50}',
+            'type': 'NVMe' if nvme else rnd.choice(['HDD', 'SSD', ' NVMe ', None]),
+            'smart_status': rnd.choice(['PASSED'] * 20 + ['FAILED', 'N/A', None]),
+            'smart_attributes': attrs if rnd.random() < .7 else json.dumps(attrs),
+        })
+        histories[f'd{i}'] = {a: {'delta': rnd.choice([0, 0, 1, -1])}
+                              for a in attrs if rnd.random() < .5}
+    return readings, histories
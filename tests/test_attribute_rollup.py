@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+rollup_attribute_values: hourly/daily tiers, committed a day at a time
+
+Fills attribute_values with irregular samples over 200 days for a few
+disks, rolls them up at once and in calls with no time budget left (one
+transaction each), and checks both against buckets computed in Python.
+
+Run: python3 -m unittest discover tests
+"""
+
+import importlib.machinery
+import importlib.util
+import random
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BIN = Path(__file__).resolve().parent.parent / 'bin'
+
+FMT = '%Y-%m-%d %H:%M:%S'
+RAW_DAYS, HOURLY_DAYS = 30, 90
+
+
+def load_fetch():
+    loader = importlib.machinery.SourceFileLoader('diskmind_fetch', str(BIN / 'diskmind_fetch'))
+    spec = importlib.util.spec_from_loader('diskmind_fetch', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+fetch = load_fetch()
+
+
+def make_samples(now: datetime) -> list[tuple]:
+    rnd = random.Random(7)
+    samples = []
+    for disk in range(4):
+        for attr_id in (1, 2, 3):
+            t = now - timedelta(days=rnd.randint(150, 200), minutes=rnd.randint(0, 1440))
+            while t < now:
+                samples.append((f'disk{disk}', attr_id, t.strftime(FMT), float(rnd.randint(0, 1000))))
+                t += timedelta(minutes=rnd.randint(30, 400))
+    return samples
+
+
+def expected_tiers(samples: list[tuple], now: datetime) -> tuple:
+    """(rollup rows, remaining raw rows) as rollup_attribute_values should leave them."""
+    raw_cutoff = (now - timedelta(days=RAW_DAYS)).strftime('%Y-%m-%d %H:00:00')
+    hour_cutoff = (now - timedelta(days=HOURLY_DAYS)).strftime('%Y-%m-%d 00:00:00')
+    buckets = {}  # (tier, attr_id, disk_id, bucket) -> [vmin, vmax, vlast, last_ts]
+    raw = []
+    for disk_id, attr_id, ts, value in sorted(samples, key=lambda s: s[2]):
+        if ts >= raw_cutoff:
+            raw.append((disk_id, attr_id, ts, value))
+            continue
+        hour = ts[:13] + ':00:00'
+        tier, bucket = ('day', ts[:10] + ' 00:00:00') if hour < hour_cutoff else ('hour', hour)
+        b = buckets.setdefault((tier, attr_id, disk_id, bucket), [value, value, value, ts])
+        b[0], b[1], b[2], b[3] = min(b[0], value), max(b[1], value), value, ts
+    rollups = sorted(key + tuple(b) for key, b in buckets.items())
+    return rollups, sorted(raw)
+
+
+class AttributeRollupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.samples = make_samples(self.now)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def rolled_up(self, name: str, time_budget: float = None) -> tuple:
+        conn = fetch.init_database(str(Path(self.tmp) / f'{name}.db'))
+        with conn:
+            conn.executemany('INSERT INTO attribute_values (disk_id, attr_id, timestamp, value) VALUES (?, ?, ?, ?)',
+                             self.samples)
+        calls = 1
+        while not fetch.rollup_attribute_values(conn, RAW_DAYS, HOURLY_DAYS, time_budget=time_budget):
+            calls += 1
+        result = (conn.execute('SELECT * FROM attribute_rollups ORDER BY 1, 2, 3, 4').fetchall(),
+                  conn.execute('SELECT * FROM attribute_values ORDER BY 1, 2, 3').fetchall())
+        conn.close()
+        return result, calls
+
+    def test_tiers(self):
+        rollups, raw = expected_tiers(self.samples, self.now)
+        (got_rollups, got_raw), _calls = self.rolled_up('once')
+        self.assertEqual(got_raw, raw)
+        self.assertEqual(got_rollups, rollups)
+
+    def test_slices_match_single_run(self):
+        once, _calls = self.rolled_up('once')
+        sliced, calls = self.rolled_up('sliced', time_budget=0)
+        self.assertGreater(calls, 100)  # A day per transaction
+        self.assertEqual(sliced, once)
+
+
+if __name__ == '__main__':
+    unittest.main()
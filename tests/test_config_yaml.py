@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+parse_simple_yaml: trailing comments and quoted values
+
+Run: python3 -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'bin'))
+from diskmind_core import parse_simple_yaml
+
+
+class ParseSimpleYamlTest(unittest.TestCase):
+
+    def test_trailing_comments(self):
+        config = parse_simple_yaml(
+            'retention: 365   # days\n'
+            'hosts:           # one per line\n'
+            '  - ssh:root@10.0.0.1  # rack 3\n'
+            'rate_limit:\n'
+            '  host_max_requests: 10  # Per pushed host\n'
+            '  url: http://x/#anchor\n'
+        )
+        self.assertEqual(config['retention'], 365)
+        self.assertEqual(config['hosts'], ['ssh:root@10.0.0.1'])
+        self.assertEqual(config['rate_limit'], {'host_max_requests': 10, 'url': 'http://x/#anchor'})
+
+    def test_quoted_values_keep_hash(self):
+        config = parse_simple_yaml(
+            'a: "Rack #3"\n'
+            "b: 'Rack #4'  # comment after the quotes\n"
+            'c: "10"\n'
+            'hosts:\n'
+            '  - "ssh:root@10.0.0.1 #x"\n'
+            'panel:\n'
+            '  title: "Disks #1"  # shown in the header\n'
+        )
+        self.assertEqual(config['a'], 'Rack #3')
+        self.assertEqual(config['b'], 'Rack #4')
+        self.assertEqual(config['c'], '10')
+        self.assertEqual(config['hosts'], ['ssh:root@10.0.0.1 #x'])
+        self.assertEqual(config['panel'], {'title': 'Disks #1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+generate_alerts: batched evaluation must match the per-disk implementation
+
+Stores a run of scans for five disks and feeds each scan to
+generate_alerts, the way diskmind_fetch does. The run covers every alert
+type:
+
+  A  state attribute changes (incl. an impossible decrease, not alerted)
+  B  cumulative counters, incl. Seagate composite Command_Timeout values
+  C  SMART status FAILED and recovered
+  D  disk status degraded and recovered
+  E  temperature baseline deviation and hard ceilings, ATA and NVMe
+
+It also covers one disk reported twice in a scan (two paths). The returned
+alerts, the alerts table and disk_status after every scan are compared to
+tests/fixtures/generate_alerts_expected.json. That file was recorded with
+the per-disk generate_alerts (one SELECT and one commit per disk, baseline
+from raw readings) that the batched version replaced. The run is repeated
+in both storage modes.
+
+Run: python3 -m unittest discover tests
+"""
+
+import importlib.machinery
+import importlib.util
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+BIN = TESTS_DIR.parent / 'bin'
+EXPECTED = TESTS_DIR / 'fixtures' / 'generate_alerts_expected.json'
+
+FMT = '%Y-%m-%d %H:%M:%S'
+
+# Subset of the backblaze preset, fixed here so preset edits don't move the test
+THRESHOLDS = {
+    'ata': {
+        'critical': {
+            'Reallocated_Sector_Ct': {'op': '>', 'value': 100, 'display': 'reallocated sectors'},
+            'Current_Pending_Sector': {'op': '>', 'value': 10, 'display': 'pending sectors'},
+            'Temperature_Celsius': {'op': '>', 'value': 55, 'display': 'temperature °C'},
+        },
+        'warning': {
+            'Reallocated_Sector_Ct': {'op': '>', 'value': 0, 'display': 'reallocated sectors'},
+            'Command_Timeout': {'op': '>', 'value': 0, 'display': 'command timeouts'},
+            'Current_Pending_Sector': {'op': '>', 'value': 0, 'display': 'pending sectors'},
+            'Temperature_Celsius': {'op': '>', 'value': 45, 'display': 'temperature °C'},
+        },
+    },
+    'nvme': {
+        'critical': {
+            'Percentage_Used': {'op': '>', 'value': 95, 'display': 'life used'},
+            'Temperature': {'op': '>', 'value': 70, 'display': 'temperature °C'},
+        },
+        'warning': {
+            'Unsafe_Shutdowns': {'op': '>', 'value': 50, 'display': 'unsafe shutdowns'},
+            'Temperature': {'op': '>', 'value': 55, 'display': 'temperature °C'},
+        },
+    },
+}
+
+DISKS = {
+    # Seagate: composite Command_Timeout (low 16 bits count)
+    'seagate': {'wwn': '5000c500a0000001', 'serial': 'ZC100001', 'model': 'ST4000NM0035', 'type': 'HDD'},
+    # No WWN: disk_id is the serial
+    'wdc': {'wwn': '', 'serial': 'WD-WCC000002', 'model': 'WDC WD40EFRX', 'type': 'HDD'},
+    'nvme': {'wwn': 'eui.0025388a00000003', 'serial': 'S4EWNX000003', 'model': 'Samsung 970 EVO', 'type': 'NVMe'},
+    'ssd': {'wwn': '500a0751a0000004', 'serial': '1920A0000004', 'model': 'CT500MX500SSD1', 'type': 'SSD'},
+    'pending': {'wwn': '50014ee2a0000005', 'serial': 'WD-WCC000005', 'model': 'WDC WD80EFAX', 'type': 'HDD'},
+}
+
+# Attributes and SMART status before the events
+QUIET = {
+    'seagate': ('PASSED', {'Temperature_Celsius': '30', 'Command_Timeout': '8590065664',
+                           'Raw_Read_Error_Rate': '123456789', 'Reallocated_Sector_Ct': '0'}),
+    'wdc': ('PASSED', {'Temperature_Celsius': '31', 'Reallocated_Sector_Ct': '0',
+                       'UDMA_CRC_Error_Count': '2'}),
+    'nvme': ('PASSED', {'Temperature': '35', 'Percentage_Used': '3', 'Unsafe_Shutdowns': '10',
+                        'Media_and_Data_Integrity_Errors': '0'}),
+    'ssd': ('PASSED', {'Temperature_Celsius': '28', 'Reallocated_Sector_Ct': '0'}),
+    'pending': ('PASSED', {'Temperature_Celsius': '33', 'Current_Pending_Sector': '0'}),
+}
+
+# (hours after the last quiet scan, [(disk, host, device, smart_status or None, attribute changes)])
+EVENTS = [
+    (6, [
+        # Command_Timeout 0 -> 2 (composite) and a warm Seagate (info vs baseline)
+        ('seagate', 'h1', '/dev/sda', None, {'Command_Timeout': '8590065666', 'Temperature_Celsius': '39'}),
+        ('wdc', 'h1', '/dev/sdb', None, {'Reallocated_Sector_Ct': '8', 'UDMA_CRC_Error_Count': '5'}),
+        ('nvme', 'h2', '/dev/nvme0n1', None, {'Temperature': '48', 'Percentage_Used': '4'}),
+        ('ssd', 'h2', '/dev/sda', 'FAILED', {}),
+        ('pending', 'h2', '/dev/sdb', None, {'Current_Pending_Sector': '3'}),
+    ]),
+    (12, [
+        # The Seagate seen through two paths, the second compares against the first
+        ('seagate', 'h1', '/dev/sda', None, {'Command_Timeout': '8590065667'}),
+        ('seagate', 'h2', '/dev/sdc', None, {'Command_Timeout': '8590065669', 'Temperature_Celsius': '31'}),
+        ('wdc', 'h1', '/dev/sdb', None, {'Reallocated_Sector_Ct': '150', 'Temperature_Celsius': '56'}),
+        ('nvme', 'h2', '/dev/nvme0n1', None, {'Temperature': '71', 'Unsafe_Shutdowns': '11'}),
+        ('ssd', 'h2', '/dev/sda', 'PASSED', {}),
+        ('pending', 'h2', '/dev/sdb', None, {'Current_Pending_Sector': '0'}),
+    ]),
+    (18, [
+        # Reallocated_Sector_Ct reported lower: not an alert, still critical
+        ('wdc', 'h1', '/dev/sdb', None, {'Reallocated_Sector_Ct': '120', 'Temperature_Celsius': '31'}),
+        ('nvme', 'h2', '/dev/nvme0n1', None, {'Temperature': '36'}),
+    ]),
+]
+
+START = datetime(2026, 3, 1, 0, 0, 0)
+QUIET_SCANS = 19  # Every 12 hours: 9 days of history before the events
+
+
+def load_fetch():
+    loader = importlib.machinery.SourceFileLoader('diskmind_fetch', str(BIN / 'diskmind_fetch'))
+    spec = importlib.util.spec_from_loader('diskmind_fetch', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def reading(disk: str, host: str, device: str, smart_status: str, attrs: dict) -> dict:
+    info = DISKS[disk]
+    return {
+        'disk_id': info['wwn'] or info['serial'], 'wwn': info['wwn'], 'serial': info['serial'],
+        'host': host, 'device': device, 'type': info['type'], 'model': info['model'],
+        'capacity_bytes': '4000787030016', 'smart_status': smart_status,
+        'smart_attributes': json.dumps(attrs),
+    }
+
+
+def scans() -> list[tuple]:
+    """All scans of the run, as (timestamp, readings) in order."""
+    state = {disk: (status, dict(attrs)) for disk, (status, attrs) in QUIET.items()}
+    placement = {'seagate': ('h1', '/dev/sda'), 'wdc': ('h1', '/dev/sdb'),
+                 'nvme': ('h2', '/dev/nvme0n1'), 'ssd': ('h2', '/dev/sda'),
+                 'pending': ('h2', '/dev/sdb')}
+    result = []
+    for i in range(QUIET_SCANS):
+        t = START + timedelta(hours=12 * i)
+        result.append((t.strftime(FMT), [reading(disk, *placement[disk], *state[disk]) for disk in DISKS]))
+    last_quiet = START + timedelta(hours=12 * (QUIET_SCANS - 1))
+    for hours, events in EVENTS:
+        readings = []
+        for disk, host, device, smart_status, changes in events:
+            status, attrs = state[disk]
+            attrs.update(changes)
+            state[disk] = (smart_status or status, attrs)
+            readings.append(reading(disk, host, device, *state[disk]))
+        result.append(((last_quiet + timedelta(hours=hours)).strftime(FMT), readings))
+    return result
+
+
+def run(fetch, core, db_path: str, store=None) -> list[dict]:
+    """Store and evaluate every scan; returns what each scan produced.
+
+    Args:
+        fetch: diskmind_fetch module (init_database, store_readings)
+        core: diskmind_core module (generate_alerts)
+        db_path: Database file to create
+        store: store_readings replacement, e.g. with changes_only set
+
+    Returns:
+        One dict per scan: timestamp, returned alerts, alerts table rows
+        and disk_status rows.
+    """
+    store = store or fetch.store_readings
+    conn = fetch.init_database(db_path)
+    recorded = []
+    for timestamp, readings in scans():
+        store(conn, readings, timestamp)
+        alerts = core.generate_alerts(conn, readings, THRESHOLDS, timestamp)
+        recorded.append({
+            'timestamp': timestamp,
+            'alerts': alerts,
+            'alert_rows': [list(row) for row in conn.execute('''
+                SELECT id, disk_id, host, timestamp, alert_type, severity,
+                       attribute, old_value, new_value, message
+                FROM alerts ORDER BY id
+            ''')],
+            'disk_status': [list(row) for row in conn.execute('''
+                SELECT disk_id, smart_status, smart_attributes, status, updated_at
+                FROM disk_status ORDER BY disk_id
+            ''')],
+        })
+    conn.close()
+    return recorded
+
+
+class GenerateAlertsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.fetch = load_fetch()
+        cls.core = cls.fetch.sys.modules['diskmind_core']
+        cls.expected = json.loads(EXPECTED.read_text())
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def check(self, changes_only: bool):
+        def store(conn, readings, timestamp):
+            self.fetch.store_readings(conn, readings, timestamp, changes_only=changes_only)
+
+        recorded = run(self.fetch, self.core, str(Path(self.tmp) / 'alerts.db'), store)
+        self.assertEqual(len(recorded), len(self.expected))
+        for got, want in zip(recorded, self.expected):
+            with self.subTest(timestamp=want['timestamp']):
+                self.assertEqual(got, want)
+
+    def test_full_storage(self):
+        self.check(changes_only=False)
+
+    def test_changes_only_storage(self):
+        self.check(changes_only=True)
+
+    def test_run_covers_every_alert_type(self):
+        alerts = [a for scan in self.expected for a in scan['alerts']]
+        self.assertEqual({a['alert_type'] for a in alerts},
+                         {'state_change', 'cumulative_burst', 'smart_status',
+                          'disk_status_change', 'temperature'})
+        self.assertEqual({a['severity'] for a in alerts if a['alert_type'] == 'temperature'},
+                         {'info', 'warning', 'critical'})
+        self.assertIn('recovery', {a['severity'] for a in alerts if a['alert_type'] == 'disk_status_change'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+diskmind_scan: --smart-mode json and text must produce the same CSV
+
+Runs the agent against a stub smartctl that replays recorded output
+(tests/fixtures/smartctl) for an ATA HDD, a failing SSD, an NVMe disk and
+a disk smartctl cannot detect. The wwn column is the disk_id on the
+server, so a mode switch must not change its hex formatting.
+
+Run: python3 -m unittest discover tests
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+SCAN = TESTS_DIR.parent / 'bin' / 'diskmind_scan'
+FIXTURES = TESTS_DIR / 'fixtures' / 'smartctl'
+STUB_BIN = TESTS_DIR / 'fixtures' / 'bin'
+
+DEVICES = ['sda', 'sdaa', 'nvme0n1', 'vda']
+
+# Replaces /sys/block discovery with the recorded devices and calls the stub
+# without sudo
+OVERRIDES = '''
+discover_devices() { for d in %s; do echo "/dev/$d"; done; }
+SMARTCTL="$SMARTCTL_BIN"
+
+''' % ' '.join(DEVICES)
+
+
+@unittest.skipUnless(shutil.which('bash') and shutil.which('jq'), 'needs bash and jq')
+class ScanModeTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        source = SCAN.read_text()
+        marker = '# Function to collect data and output CSV'
+        assert marker in source
+        cls.scan = Path(cls.tmp) / 'diskmind_scan'
+        cls.scan.write_text(source.replace(marker, OVERRIDES + marker, 1))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def run_scan(self, mode):
+        env = dict(os.environ,
+                   PATH=f"{STUB_BIN}{os.pathsep}{os.environ.get('PATH', '')}",
+                   SMARTCTL_FIXTURES=str(FIXTURES))
+        result = subprocess.run(['bash', str(self.scan), '--smart-mode', mode],
+                                env=env, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.splitlines()
+
+    def test_modes_match(self):
+        self.assertEqual(self.run_scan('json'), self.run_scan('text'))
+
+    def test_rows(self):
+        rows = {line.split(',')[2]: line.split(',')[:10] for line in self.run_scan('json')[1:]}
+
+        # Undetectable disk is skipped
+        self.assertEqual(sorted(rows), ['/dev/nvme0n1', '/dev/sda', '/dev/sdaa'])
+
+        # NAA 5 WWN and NVMe EUI-64 as 16 lowercase hex digits, leading zeros kept
+        self.assertEqual(rows['/dev/sda'][:2], ['5000c500a1b2c3d4', 'ZC1A2B3C'])
+        self.assertEqual(rows['/dev/sdaa'][:2], ['5002538e40a1b2c3', 'S3Z1NB0K123456X'])
+        self.assertEqual(rows['/dev/nvme0n1'][:2], ['002538b981b0ab12', 'S4EWNX0N812345A'])
+
+        self.assertEqual(rows['/dev/sda'][3], 'HDD')
+        self.assertEqual(rows['/dev/sdaa'][3], 'SSD')
+        self.assertEqual(rows['/dev/nvme0n1'][3], 'NVMe')
+        self.assertEqual(rows['/dev/sda'][9], 'PASSED')
+        self.assertEqual(rows['/dev/sdaa'][9], 'FAILED')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+get_ssh_control_dir: ControlMaster sockets only in a directory private to us
+
+Run: python3 -m unittest discover tests
+"""
+
+import importlib.machinery
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BIN = Path(__file__).resolve().parent.parent / 'bin'
+
+
+def load_fetch():
+    loader = importlib.machinery.SourceFileLoader('diskmind_fetch', str(BIN / 'diskmind_fetch'))
+    spec = importlib.util.spec_from_loader('diskmind_fetch', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+fetch = load_fetch()
+
+
+class ControlDirTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = Path(self.tmp) / f'diskmind-ssh-{os.getuid()}'
+        env = {k: v for k, v in os.environ.items() if k != 'XDG_RUNTIME_DIR'}
+        patches = [mock.patch.dict(os.environ, env, clear=True),
+                   mock.patch.object(fetch.tempfile, 'gettempdir', return_value=self.tmp),
+                   mock.patch('sys.stderr')]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        fetch._control_dir_warned = False
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_created_private(self):
+        self.assertEqual(fetch.get_ssh_control_dir(), self.path)
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o700)
+
+    def test_refuses_open_mode(self):
+        self.path.mkdir(mode=0o777)
+        os.chmod(self.path, 0o777)
+        self.assertIsNone(fetch.get_ssh_control_dir())
+
+    def test_refuses_symlink(self):
+        target = Path(self.tmp) / 'elsewhere'
+        target.mkdir(mode=0o700)
+        self.path.symlink_to(target)
+        self.assertIsNone(fetch.get_ssh_control_dir())
+
+    def test_refuses_other_owner(self):
+        self.path.mkdir(mode=0o700)
+        real_lstat = os.lstat
+
+        def foreign_lstat(path):
+            st = real_lstat(path)
+            return os.stat_result((st.st_mode, st.st_ino, st.st_dev, st.st_nlink,
+                                   st.st_uid + 1, st.st_gid, st.st_size,
+                                   st.st_atime, st.st_mtime, st.st_ctime))
+
+        with mock.patch.object(fetch.os, 'lstat', foreign_lstat):
+            self.assertIsNone(fetch.get_ssh_control_dir())
+
+    def test_direct_ssh_without_safe_dir(self):
+        cmd = fetch._ssh_base_cmd('10.0.0.1', 'root', 10, control_dir=None)
+        self.assertFalse(any(arg.startswith('ControlPath=') for arg in cmd))
+
+
+if __name__ == '__main__':
+    unittest.main()
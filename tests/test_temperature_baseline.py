@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Type E temperature baseline: the average over exactly the last
+TEMP_BASELINE_DAYS before the scan, whatever time of day the cut falls on
+
+Stores a disk's scans every 5 hours over 20 days (cooler on the day the
+window starts, so counting that day whole would move the average), then
+checks the baseline in the alert against the average over the scans newer
+than timestamp - TEMP_BASELINE_DAYS, in both storage modes.
+
+Run: python3 -m unittest discover tests
+"""
+
+import importlib.machinery
+import importlib.util
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BIN = Path(__file__).resolve().parent.parent / 'bin'
+
+
+def load_fetch():
+    loader = importlib.machinery.SourceFileLoader('diskmind_fetch', str(BIN / 'diskmind_fetch'))
+    spec = importlib.util.spec_from_loader('diskmind_fetch', loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+fetch = load_fetch()
+core = fetch.sys.modules['diskmind_core']
+
+FMT = '%Y-%m-%d %H:%M:%S'
+
+
+def reading(temperature: float) -> dict:
+    return {
+        'wwn': '5000c500a1b2c3d4', 'serial': 'ZC1A2B3C', 'host': 'h1', 'device': '/dev/sda',
+        'type': 'HDD', 'model': 'ST4000NM0035', 'capacity_bytes': '4000787030016',
+        'smart_status': 'PASSED',
+        'smart_attributes': json.dumps({'Temperature_Celsius': str(temperature), 'Power_On_Hours': '100'}),
+    }
+
+
+class TemperatureBaselineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def check(self, scan_time: datetime, changes_only: bool):
+        conn = fetch.init_database(str(Path(self.tmp) / f'{scan_time:%H%M}{changes_only}.db'))
+        cut = scan_time - timedelta(days=core.TEMP_BASELINE_DAYS)
+        temperatures = {}
+        t = scan_time - timedelta(days=20)
+        while t < scan_time:
+            # 25°C on the day the window starts, 30°C otherwise (repeats merge with changes_only)
+            temperatures[t] = 25 if t.date() == cut.date() else 30
+            t += timedelta(hours=5)
+        for t, temperature in temperatures.items():
+            fetch.store_readings(conn, [reading(temperature)], t.strftime(FMT), changes_only=changes_only)
+            core.generate_alerts(conn, [dict(reading(temperature), disk_id='5000c500a1b2c3d4')],
+                                 {'ata': {}, 'nvme': {}}, t.strftime(FMT))
+
+        now = scan_time.strftime(FMT)
+        temperatures[scan_time] = 50
+        fetch.store_readings(conn, [reading(50)], now, changes_only=changes_only)
+        alerts = core.generate_alerts(conn, [dict(reading(50), disk_id='5000c500a1b2c3d4')],
+                                      {'ata': {}, 'nvme': {}}, now)
+        conn.close()
+
+        window = [v for t, v in temperatures.items() if t > cut]
+        expected = sum(window) / len(window)
+        temperature_alerts = [a for a in alerts if a['alert_type'] == 'temperature']
+        self.assertEqual(len(temperature_alerts), 1)
+        self.assertEqual(temperature_alerts[0]['old_value'], core._fmt_val(expected))
+
+    def test_exact_window(self):
+        for hour in (1, 9, 13, 22):
+            for changes_only in (False, True):
+                with self.subTest(hour=hour, changes_only=changes_only):
+                    self.check(datetime(2026, 3, 20, hour, 17, 0), changes_only)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+ThresholdPlan: same status and issues as the rule-by-rule evaluation
+
+Evaluates synthetic disks (ATA and NVMe, packed Seagate values, unparsable
+values, JSON and dict attributes, random history deltas) under every
+shipped preset plus one with unusual rules. The compiled plan and the
+classify_disk/get_disk_issues wrappers must agree with the reference
+implementation in tests/reference_thresholds.py, for alerts (no history)
+and for dashboard delta ranges.
+
+Run: python3 -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import reference_thresholds as reference
+import diskmind_core as core
+
+DISKS = 2000
+
+
+class ThresholdPlanTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.presets = reference.load_presets()
+        cls.readings, cls.histories = reference.make_disks(DISKS)
+
+    def test_matches_reference(self):
+        for name, thresholds in self.presets.items():
+            plan = core.get_threshold_plan(thresholds)
+            for delta_days in (None, 7, 36500):
+                with self.subTest(preset=name, delta_days=delta_days):
+                    histories = self.histories if delta_days else None
+                    results = plan.evaluate_many(self.readings, histories, delta_days)
+                    for r, (status, issues) in zip(self.readings, results):
+                        history = histories[r['disk_id']] if histories else None
+                        expected = (reference.classify_disk(r, thresholds, history, delta_days),
+                                    reference.get_disk_issues(r, thresholds, history, delta_days))
+                        self.assertEqual((status, issues), expected, r)
+                        self.assertEqual((core.classify_disk(r, thresholds, history, delta_days),
+                                          core.get_disk_issues(r, thresholds, history, delta_days)),
+                                         expected, r)
+
+    def test_inputs_reach_every_level(self):
+        plan = core.get_threshold_plan(self.presets['odd'])
+        statuses = {status for status, _issues in plan.evaluate_many(self.readings)}
+        self.assertEqual(statuses, {'ok', 'warning', 'critical'})
+
+
+if __name__ == '__main__':
+    unittest.main()